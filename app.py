@@ -13,14 +13,13 @@ from datetime import datetime, timedelta
 import os
 
 # Import custom modules
-from modules.data_loader import DataLoader
-from modules.cloud_data_loader import CloudDataLoader
+from modules.data_loader import DataLoader, UNASSIGNED
 from modules.roster_manager import RosterManager
 from modules.drone_inventory import DroneInventory
 from modules.assignment_tracker import AssignmentTracker
 from modules.conflict_detector import ConflictDetector
-from utils.llm_handler import LLMHandler
-from utils.sheets_sync import GoogleSheetsSync
+# CloudDataLoader, GoogleSheetsSync and LLMHandler are imported where they are
+# first needed so local mode starts without loading gspread/google-auth
 
 # Helper function to fix datetime columns for display
 def fix_df_for_display(df):
@@ -31,6 +30,50 @@ def fix_df_for_display(df):
         df[col] = df[col].apply(lambda x: str(x) if hasattr(x, 'strftime') or 'date' in str(type(x)).lower() else x)
     return df
 
+def paged_dataframe(df, key, page_size=100):
+    """Render one page of a dataframe with prev/next controls so only that page is serialized"""
+    page_key = f"{key}_page"
+    page_count = max(1, -(-len(df) // page_size))
+    page = min(st.session_state.get(page_key, 0), page_count - 1)
+    st.session_state[page_key] = page
+    
+    if page_count > 1:
+        col1, col2, col3 = st.columns([1, 3, 1])
+        with col1:
+            st.button("◀ Prev", key=f"{key}_prev", disabled=page == 0,
+                      on_click=_shift_page, args=(page_key, -1))
+        with col2:
+            st.caption(f"Page {page + 1} of {page_count} ({len(df)} rows)")
+        with col3:
+            st.button("Next ▶", key=f"{key}_next", disabled=page == page_count - 1,
+                      on_click=_shift_page, args=(page_key, 1))
+    
+    st.dataframe(fix_df_for_display(df.iloc[page * page_size:(page + 1) * page_size]), use_container_width=True)
+
+def _shift_page(page_key, step):
+    """Move a paged_dataframe to the previous/next page"""
+    st.session_state[page_key] += step
+
+# Helper functions to build selectbox label maps without iterrows()
+def _pilot_name_map(pilots):
+    """Map pilot_id to pilot name"""
+    return dict(zip(pilots['pilot_id'].values, pilots['name'].values))
+
+def _pilot_label_map(pilots):
+    """Map pilot_id to a 'name (id)' label"""
+    ids = pilots['pilot_id'].values
+    return dict(zip(ids, [f"{n} ({p})" for n, p in zip(pilots['name'].values, ids)]))
+
+def _drone_label_map(drones):
+    """Map drone_id to a 'model (id)' label"""
+    ids = drones['drone_id'].values
+    return dict(zip(ids, [f"{m} ({d})" for m, d in zip(drones['model'].values, ids)]))
+
+def _mission_label_map(missions):
+    """Map project_id to a 'client (id)' label"""
+    ids = missions['project_id'].values
+    return dict(zip(ids, [f"{c} ({p})" for c, p in zip(missions['client'].values, ids)]))
+
 # ============ DEPLOYMENT MODE DETECTION ============
 # Check for Streamlit Cloud secrets first, then environment variables
 def get_secret(key, default=''):
@@ -58,46 +101,276 @@ USE_GOOGLE_SHEETS = get_secret('USE_GOOGLE_SHEETS', 'false').lower() == 'true'
 GOOGLE_SHEETS_CREDS = get_gcp_credentials()
 SPREADSHEET_ID = get_secret('GOOGLE_SHEETS_ID', '')
 
+# ============ SHARED RESOURCES ============
+# Loaders and managers are created once per server process and shared by all sessions
+@st.cache_resource
+def get_sheets_sync(credentials_json, spreadsheet_id):
+    """Authenticate with Google Sheets and open the spreadsheet"""
+    from utils.sheets_sync import GoogleSheetsSync
+    sheets_sync = GoogleSheetsSync(credentials_json)
+    if not sheets_sync.open_spreadsheet(spreadsheet_id):
+        raise Exception("Could not open spreadsheet")
+    return sheets_sync
+
+@st.cache_resource
+def get_data_loader(use_sheets, _sheets_sync=None):
+    """Get data loader for the selected storage backend"""
+    if use_sheets:
+        from modules.cloud_data_loader import CloudDataLoader
+        return CloudDataLoader(use_sheets=True, sheets_sync=_sheets_sync)
+    return DataLoader()
+
+@st.cache_resource
+def get_roster_manager(_data_loader, loader_id):
+    """Get roster manager bound to the data loader"""
+    return RosterManager(_data_loader)
+
+@st.cache_resource
+def get_drone_inventory(_data_loader, loader_id):
+    """Get drone inventory bound to the data loader"""
+    return DroneInventory(_data_loader)
+
+@st.cache_resource
+def get_assignment_tracker(_data_loader, loader_id):
+    """Get assignment tracker bound to the data loader"""
+    return AssignmentTracker(
+        _data_loader,
+        get_roster_manager(_data_loader, loader_id),
+        get_drone_inventory(_data_loader, loader_id)
+    )
+
+@st.cache_resource
+def get_conflict_detector(_data_loader, loader_id):
+    """Get conflict detector bound to the data loader"""
+    return ConflictDetector(_data_loader)
+
 # Initialize session state
 if 'data_loader' not in st.session_state:
     try:
-        sheets_sync = None
-        
         # Try to set up Google Sheets if enabled
         if USE_GOOGLE_SHEETS and GOOGLE_SHEETS_CREDS and SPREADSHEET_ID:
             try:
-                sheets_sync = GoogleSheetsSync(GOOGLE_SHEETS_CREDS)
-                if sheets_sync.open_spreadsheet(SPREADSHEET_ID):
-                    st.session_state.sheets_sync = sheets_sync
-                    st.session_state.data_loader = CloudDataLoader(use_sheets=True, sheets_sync=sheets_sync)
-                    st.session_state.using_sheets = True
-                else:
-                    raise Exception("Could not open spreadsheet")
+                sheets_sync = get_sheets_sync(GOOGLE_SHEETS_CREDS, SPREADSHEET_ID)
+                st.session_state.sheets_sync = sheets_sync
+                st.session_state.data_loader = get_data_loader(True, sheets_sync)
+                st.session_state.using_sheets = True
             except Exception as e:
-                st.warning(f"Google Sheets setup failed: {e}, falling back to CSV")
-                st.session_state.data_loader = DataLoader()
+                st.warning(f"Google Sheets setup failed: {e}, falling back to local files")
+                st.session_state.data_loader = get_data_loader(False)
                 st.session_state.using_sheets = False
         else:
-            # Local development - use CSV files
-            st.session_state.data_loader = DataLoader()
+            # Local development - use local files
+            st.session_state.data_loader = get_data_loader(False)
             st.session_state.sheets_sync = None
             st.session_state.using_sheets = False
         
-        st.session_state.roster_manager = RosterManager(st.session_state.data_loader)
-        st.session_state.drone_inventory = DroneInventory(st.session_state.data_loader)
-        st.session_state.assignment_tracker = AssignmentTracker(
-            st.session_state.data_loader,
-            st.session_state.roster_manager,
-            st.session_state.drone_inventory
-        )
-        st.session_state.conflict_detector = ConflictDetector(st.session_state.data_loader)
-        st.session_state.llm_handler = LLMHandler()
+        data_loader = st.session_state.data_loader
+        st.session_state.roster_manager = get_roster_manager(data_loader, id(data_loader))
+        st.session_state.drone_inventory = get_drone_inventory(data_loader, id(data_loader))
+        st.session_state.assignment_tracker = get_assignment_tracker(data_loader, id(data_loader))
+        st.session_state.conflict_detector = get_conflict_detector(data_loader, id(data_loader))
         st.session_state.init_success = True
     except Exception as e:
         st.error(f"Failed to initialize app: {e}")
         st.session_state.init_success = False
         st.stop()
 
+# ============ CACHED DATA ACCESS ============
+# Dataframes are memoized per data key so reruns don't re-copy them on every read.
+# Every edit changes the key, so only the newest few versions are kept
+CACHE_VERSIONS = 3
+# Mission details are also keyed by project, keep room for several per version
+MISSION_DETAILS_CACHE_ENTRIES = 32
+
+# The loaders keep status/location as categoricals, so filter dropdowns read their
+# options from .cat.categories instead of scanning with unique(); edits can leave
+# values no row uses any more, which are dropped here
+def _tight_categories(df, columns=('status', 'location')):
+    """Make categorical columns list only the values currently present"""
+    for col in columns:
+        df[col] = df[col].cat.remove_unused_categories()
+    return df
+
+@st.cache_data(ttl=300, max_entries=CACHE_VERSIONS)
+def load_pilots(_data_loader, data_key):
+    """Load pilots dataframe for the given data key"""
+    return _tight_categories(_data_loader.get_pilots())
+
+@st.cache_data(ttl=300, max_entries=CACHE_VERSIONS)
+def load_drones(_data_loader, data_key):
+    """Load drones dataframe for the given data key"""
+    return _tight_categories(_data_loader.get_drones())
+
+@st.cache_data(ttl=300, max_entries=CACHE_VERSIONS)
+def load_missions(_data_loader, data_key):
+    """Load missions dataframe for the given data key"""
+    return _data_loader.get_missions()
+
+def get_data_key():
+    """Cache key that changes whenever the data loader is replaced or its data is edited"""
+    data_loader = st.session_state.data_loader
+    return (id(data_loader), data_loader.data_version)
+
+def get_pilots_cached():
+    """Get pilots dataframe from cache"""
+    return load_pilots(st.session_state.data_loader, get_data_key())
+
+def get_drones_cached():
+    """Get drones dataframe from cache"""
+    return load_drones(st.session_state.data_loader, get_data_key())
+
+def get_missions_cached():
+    """Get missions dataframe from cache"""
+    return load_missions(st.session_state.data_loader, get_data_key())
+
+@st.cache_data(ttl=300, max_entries=CACHE_VERSIONS)
+def load_missions_by_id(_data_loader, data_key):
+    """Missions indexed by project_id (first row per id) for hash lookups"""
+    missions = load_missions(_data_loader, data_key)
+    return missions.drop_duplicates('project_id').set_index('project_id', drop=False)
+
+def _value_counts(df, column):
+    """Count every value of a column in one pass as {value: count}"""
+    return {value: int(count) for value, count in df[column].value_counts().items()}
+
+@st.cache_data(ttl=300, max_entries=CACHE_VERSIONS)
+def load_counts(_data_loader, data_key):
+    """Count totals and per-status/priority breakdowns for the given data key"""
+    pilots = load_pilots(_data_loader, data_key)
+    drones = load_drones(_data_loader, data_key)
+    missions = load_missions(_data_loader, data_key)
+    pilot_status = _value_counts(pilots, 'status')
+    drone_status = _value_counts(drones, 'status')
+    mission_priority = _value_counts(missions, 'priority')
+    return {
+        'total_pilots': len(pilots),
+        'available_pilots': pilot_status.get('Available', 0),
+        'total_drones': len(drones),
+        'available_drones': drone_status.get('Available', 0),
+        'total_missions': len(missions),
+        'urgent_missions': mission_priority.get('Urgent', 0),
+        'pilot_status': pilot_status,
+        'drone_status': drone_status,
+        'mission_priority': mission_priority
+    }
+
+def get_counts_cached():
+    """Get resource counts from cache"""
+    return load_counts(st.session_state.data_loader, get_data_key())
+
+@st.cache_data(ttl=300, max_entries=CACHE_VERSIONS)
+def load_conflict_analysis(_conflict_detector, data_key):
+    """Run conflict detection once for the given data key"""
+    return _conflict_detector.analyze()
+
+def get_conflict_analysis_cached():
+    """Get conflict analysis ('all', 'summary', 'critical') from cache"""
+    return load_conflict_analysis(st.session_state.conflict_detector, get_data_key())
+
+@st.cache_data(ttl=300, max_entries=CACHE_VERSIONS)
+def load_conflicts_by_type(_conflict_detector, data_key):
+    """Build one conflicts table per conflict type for the given data key"""
+    by_type = {}
+    for conflict in load_conflict_analysis(_conflict_detector, data_key)['all']:
+        by_type.setdefault(conflict['type'], []).append(conflict)
+    return {conflict_type: pd.DataFrame(rows) for conflict_type, rows in by_type.items()}
+
+def get_conflicts_by_type_cached():
+    """Get {type: conflicts dataframe} from cache"""
+    return load_conflicts_by_type(st.session_state.conflict_detector, get_data_key())
+
+@st.cache_data(ttl=300, max_entries=CACHE_VERSIONS)
+def load_assignments(_assignment_tracker, data_key):
+    """Build the active assignments table for the given data key"""
+    return pd.DataFrame(_assignment_tracker.get_active_assignments())
+
+def get_assignments_cached():
+    """Get active assignments dataframe from cache"""
+    return load_assignments(st.session_state.assignment_tracker, get_data_key())
+
+@st.cache_data(ttl=300, max_entries=MISSION_DETAILS_CACHE_ENTRIES)
+def load_mission_details(_data_loader, _assignment_tracker, data_key, project_id):
+    """Get mission details with assigned pilots/drones as dataframes for the given data key"""
+    details = _assignment_tracker.get_mission_details_with_assignments(
+        project_id,
+        missions_by_id=load_missions_by_id(_data_loader, data_key),
+        pilots=load_pilots(_data_loader, data_key),
+        drones=load_drones(_data_loader, data_key)
+    )
+    if details:
+        details = {
+            **details,
+            'assigned_pilots': pd.DataFrame(details['assigned_pilots']),
+            'assigned_drones': pd.DataFrame(details['assigned_drones'])
+        }
+    return details
+
+def get_mission_details_cached(project_id):
+    """Get mission details from cache"""
+    return load_mission_details(
+        st.session_state.data_loader,
+        st.session_state.assignment_tracker,
+        get_data_key(),
+        project_id
+    )
+
+@st.cache_data(ttl=300, max_entries=CACHE_VERSIONS)
+def load_chat_context(_data_loader, _assignment_tracker, _conflict_detector, data_key):
+    """Build the system state summary sent to the LLM for the given data key"""
+    counts = load_counts(_data_loader, data_key)
+    conflicts = load_conflict_analysis(_conflict_detector, data_key)['summary']
+    assignments = load_assignments(_assignment_tracker, data_key)
+    return f"""
+Current System State:
+- Total Pilots: {counts['total_pilots']} ({counts['available_pilots']} available)
+- Total Drones: {counts['total_drones']} ({counts['available_drones']} available)
+- Active Assignments: {len(assignments)}
+- Detected Conflicts: {conflicts['total_conflicts']}
+"""
+
+def get_chat_context_cached():
+    """Get chat context string from cache"""
+    return load_chat_context(
+        st.session_state.data_loader,
+        st.session_state.assignment_tracker,
+        st.session_state.conflict_detector,
+        get_data_key()
+    )
+
+# ============ SAVING ============
+# Edits mark rows dirty on the shared data loader; one background flush per loader
+# writes them a moment later, so quick edits from every session share one write
+FLUSH_DELAY = 2  # seconds
+
+def flush_data():
+    """Schedule a background write of the rows edited since the last flush"""
+    st.session_state.data_loader.schedule_flush(FLUSH_DELAY)
+
+def report_pending_saves():
+    """Show a toast for background saves that failed since the last rerun"""
+    data_loader = st.session_state.data_loader
+    # A flush writes every session's edits, so failures are counted on the shared loader
+    # and every session compares that count to the one it last saw
+    seen_loader, seen_failures = st.session_state.get('seen_flush_failures', (None, 0))
+    if seen_loader == id(data_loader) and data_loader.flush_failures > seen_failures:
+        st.toast("⚠️ Some recent changes could not be saved yet. They stay pending and are retried with the next save")
+    st.session_state.seen_flush_failures = (id(data_loader), data_loader.flush_failures)
+
+# Sidebar quick stats refresh on their own without rerunning the page body
+@st.fragment(run_every=30)
+def show_quick_stats():
+    """Show quick stats metrics"""
+    counts = get_counts_cached()
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Available Pilots", counts['available_pilots'])
+        st.metric("Available Drones", counts['available_drones'])
+    with col2:
+        st.metric("Active Missions", counts['total_missions'])
+        conflicts = get_conflict_analysis_cached()['summary']
+        st.metric("Conflicts", conflicts['total_conflicts'])
+
 # Sidebar
 with st.sidebar:
     st.title("🚁 Skylark Drones")
@@ -107,32 +380,19 @@ with st.sidebar:
     if st.session_state.get('using_sheets', False):
         st.success("☁️ Cloud Mode (Google Sheets)")
     else:
-        st.info("💾 Local Mode (CSV Files)")
+        st.info("💾 Local Mode (Local Files)")
     
     page = st.radio(
         "Navigate",
         ["Dashboard", "Roster", "Inventory", "Assignments", "Conflicts", "Chat Assistant", "Settings"]
     )
     
+    report_pending_saves()
+    
     st.divider()
     st.subheader("Quick Stats")
     
-    pilots = st.session_state.data_loader.get_pilots()
-    drones = st.session_state.data_loader.get_drones()
-    missions = st.session_state.data_loader.get_missions()
-    
-    available_pilots = len(pilots[pilots['status'] == 'Available'])
-    available_drones = len(drones[drones['status'] == 'Available'])
-    active_missions = len(missions)
-    
-    col1, col2 = st.columns(2)
-    with col1:
-        st.metric("Available Pilots", available_pilots)
-        st.metric("Available Drones", available_drones)
-    with col2:
-        st.metric("Active Missions", active_missions)
-        conflicts = st.session_state.conflict_detector.get_conflicts_summary()
-        st.metric("Conflicts", conflicts['total_conflicts'])
+    show_quick_stats()
 
 # Define all page functions
 def show_dashboard():
@@ -140,41 +400,38 @@ def show_dashboard():
     
     col1, col2, col3, col4 = st.columns(4)
     
-    pilots = st.session_state.data_loader.get_pilots()
-    drones = st.session_state.data_loader.get_drones()
-    missions = st.session_state.data_loader.get_missions()
+    counts = get_counts_cached()
+    analysis = get_conflict_analysis_cached()
     
     with col1:
-        st.metric("Total Pilots", len(pilots))
-        st.metric("Available", len(pilots[pilots['status'] == 'Available']))
+        st.metric("Total Pilots", counts['total_pilots'])
+        st.metric("Available", counts['available_pilots'])
     
     with col2:
-        st.metric("Total Drones", len(drones))
-        st.metric("Available", len(drones[drones['status'] == 'Available']))
+        st.metric("Total Drones", counts['total_drones'])
+        st.metric("Available", counts['available_drones'])
     
     with col3:
-        st.metric("Active Missions", len(missions))
-        st.metric("Urgent Priority", len(missions[missions['priority'] == 'Urgent']))
+        st.metric("Active Missions", counts['total_missions'])
+        st.metric("Urgent Priority", counts['urgent_missions'])
     
     with col4:
-        conflicts = st.session_state.conflict_detector.get_conflicts_summary()
-        st.metric("Total Conflicts", conflicts['total_conflicts'])
-        st.metric("Critical Issues", conflicts['critical'])
+        st.metric("Total Conflicts", analysis['summary']['total_conflicts'])
+        st.metric("Critical Issues", analysis['summary']['critical'])
     
     st.divider()
     
     # Active Assignments
     st.subheader("🔗 Active Assignments")
-    assignments = st.session_state.assignment_tracker.get_active_assignments()
-    if assignments:
-        df = pd.DataFrame(assignments)
-        st.dataframe(df, use_container_width=True)
+    assignments = get_assignments_cached()
+    if not assignments.empty:
+        st.dataframe(assignments, use_container_width=True)
     else:
         st.info("No active assignments")
     
     # Recent Conflicts
     st.subheader("⚠️ Detected Conflicts")
-    conflicts = st.session_state.conflict_detector.get_all_conflicts()
+    conflicts = analysis['all']
     if conflicts:
         for conflict in conflicts[:5]:  # Show top 5
             with st.container(border=True):
@@ -187,6 +444,117 @@ def show_dashboard():
     else:
         st.success("✅ No conflicts detected!")
 
+@st.fragment
+def show_roster_search():
+    """Find pilots by criteria"""
+    st.subheader("Find Pilots by Criteria")
+    
+    pilots = get_pilots_cached()
+    search_type = st.selectbox("Search by", ["Skill", "Certification", "Location", "Status"])
+    
+    if search_type == "Skill":
+        skills = ['Mapping', 'Inspection', 'Survey', 'Thermal']
+        selected_skill = st.selectbox("Select Skill", skills)
+        results = st.session_state.roster_manager.get_pilots_by_skill(selected_skill)
+        paged_dataframe(results, key="pilot_search")
+    
+    elif search_type == "Certification":
+        certs = ['DGCA', 'Night Ops']
+        selected_cert = st.selectbox("Select Certification", certs)
+        results = st.session_state.roster_manager.get_pilots_by_certification(selected_cert)
+        paged_dataframe(results, key="pilot_search")
+    
+    elif search_type == "Location":
+        locations = pilots['location'].cat.categories
+        selected_location = st.selectbox("Select Location", locations)
+        results = st.session_state.roster_manager.get_pilots_by_location(selected_location)
+        paged_dataframe(results, key="pilot_search")
+    
+    elif search_type == "Status":
+        statuses = pilots['status'].cat.categories
+        selected_status = st.selectbox("Select Status", statuses)
+        results = st.session_state.roster_manager.get_pilots_by_status(selected_status)
+        paged_dataframe(results, key="pilot_search")
+
+def apply_pilot_edits(pilot_ids):
+    """Apply rows changed in the pilot editor, then flush them in one write"""
+    edited_rows = st.session_state.pilot_editor['edited_rows']
+    for row, fields in edited_rows.items():
+        # Same as mark_pilot_available: an available pilot has no assignment
+        if fields.get('status') == 'Available':
+            fields = {**fields, 'current_assignment': UNASSIGNED}
+        st.session_state.data_loader.update_pilot(pilot_ids[row], fields)
+    if edited_rows:
+        flush_data()
+
+@st.fragment
+def show_roster_update():
+    """Update pilot status"""
+    pilots = get_pilots_cached()
+    
+    st.subheader("Quick Edit")
+    st.caption("Edit status or location inline. Use the form below to assign a mission or set a leave date.")
+    st.data_editor(
+        pilots[['pilot_id', 'name', 'status', 'location']].astype({'status': 'str', 'location': 'str'}),
+        key='pilot_editor',
+        num_rows='fixed',
+        hide_index=True,
+        disabled=['pilot_id', 'name'],
+        column_config={
+            'status': st.column_config.SelectboxColumn('status', options=['Available', 'On Leave', 'Unavailable'])
+        },
+        on_change=apply_pilot_edits,
+        args=(pilots['pilot_id'].tolist(),),
+        use_container_width=True
+    )
+    
+    st.subheader("Update Pilot Status")
+    
+    pilot_names = _pilot_name_map(pilots)
+    
+    pilot_id = st.selectbox("Select Pilot", list(pilot_names), format_func=pilot_names.get)
+    
+    new_status = st.selectbox("New Status", ["Available", "On Leave", "Assigned", "Unavailable"])
+    
+    if new_status == "Assigned":
+        missions = get_missions_cached()
+        mission_options = _mission_label_map(missions)
+        selected_mission = st.selectbox("Assign to Mission", list(mission_options), format_func=mission_options.get)
+        
+        if st.button("✅ Update Assignment"):
+            result = st.session_state.assignment_tracker.assign_pilot_to_mission(pilot_id, selected_mission)
+            if result['success']:
+                flush_data()
+                if result.get('warning'):
+                    st.warning(result['message'])
+                else:
+                    st.success(result['message'])
+            else:
+                st.error(result['message'])
+    
+    elif new_status == "On Leave":
+        available_from = st.date_input("Available From")
+        if st.button("✅ Mark On Leave"):
+            result = st.session_state.roster_manager.mark_pilot_on_leave(pilot_id, available_from)
+            if result['success']:
+                flush_data()
+                if result.get('has_conflict'):
+                    st.warning(result['message'])
+                    st.info("👉 Go to **Conflicts → Urgent Reassignments** to auto-reassign")
+                else:
+                    st.success(result['message'])
+            else:
+                st.error(result['message'])
+    
+    else:
+        if st.button(f"✅ Mark {new_status}"):
+            result = st.session_state.roster_manager.mark_pilot_available(pilot_id)
+            if result['success']:
+                flush_data()
+                st.success(result['message'])
+            else:
+                st.error(result['message'])
+
 def show_roster():
     st.title("👨‍✈️ Pilot Roster Management")
     
@@ -194,88 +562,114 @@ def show_roster():
     
     with tab1:
         st.subheader("All Pilots")
-        pilots = st.session_state.data_loader.get_pilots()
-        st.dataframe(fix_df_for_display(pilots), use_container_width=True)
+        pilots = get_pilots_cached()
+        paged_dataframe(pilots, key="pilot_roster")
     
     with tab2:
-        st.subheader("Find Pilots by Criteria")
-        
-        search_type = st.selectbox("Search by", ["Skill", "Certification", "Location", "Status"])
-        
-        if search_type == "Skill":
-            skills = ['Mapping', 'Inspection', 'Survey', 'Thermal']
-            selected_skill = st.selectbox("Select Skill", skills)
-            results = st.session_state.roster_manager.get_pilots_by_skill(selected_skill)
-            st.dataframe(fix_df_for_display(results), use_container_width=True)
-        
-        elif search_type == "Certification":
-            certs = ['DGCA', 'Night Ops']
-            selected_cert = st.selectbox("Select Certification", certs)
-            results = st.session_state.roster_manager.get_pilots_by_certification(selected_cert)
-            st.dataframe(fix_df_for_display(results), use_container_width=True)
-        
-        elif search_type == "Location":
-            locations = pilots['location'].unique()
-            selected_location = st.selectbox("Select Location", locations)
-            results = st.session_state.roster_manager.get_pilots_by_location(selected_location)
-            st.dataframe(fix_df_for_display(results), use_container_width=True)
-        
-        elif search_type == "Status":
-            statuses = pilots['status'].unique()
-            selected_status = st.selectbox("Select Status", statuses)
-            results = st.session_state.roster_manager.get_pilots_by_status(selected_status)
-            st.dataframe(fix_df_for_display(results), use_container_width=True)
+        show_roster_search()
     
     with tab3:
-        st.subheader("Update Pilot Status")
-        
-        pilots = st.session_state.data_loader.get_pilots()
-        pilot_names = {row['name']: row['pilot_id'] for _, row in pilots.iterrows()}
-        
-        selected_pilot = st.selectbox("Select Pilot", list(pilot_names.keys()))
-        pilot_id = pilot_names[selected_pilot]
-        
-        new_status = st.selectbox("New Status", ["Available", "On Leave", "Assigned", "Unavailable"])
-        
-        if new_status == "Assigned":
-            missions = st.session_state.data_loader.get_missions()
-            mission_options = {row['project_id']: row['client'] for _, row in missions.iterrows()}
-            selected_mission = st.selectbox("Assign to Mission", list(mission_options.keys()))
-            
-            if st.button("✅ Update Assignment"):
-                result = st.session_state.assignment_tracker.assign_pilot_to_mission(pilot_id, selected_mission)
-                if result['success']:
-                    st.session_state.data_loader.save_pilots()
-                    st.session_state.data_loader.save_missions()
-                    if result.get('warning'):
-                        st.warning(result['message'])
-                    else:
-                        st.success(result['message'])
-                else:
-                    st.error(result['message'])
-        
-        elif new_status == "On Leave":
-            available_from = st.date_input("Available From")
-            if st.button("✅ Mark On Leave"):
-                result = st.session_state.roster_manager.mark_pilot_on_leave(pilot_id, available_from)
-                if result['success']:
-                    st.session_state.data_loader.save_pilots()
-                    if result.get('has_conflict'):
-                        st.warning(result['message'])
-                        st.info("👉 Go to **Conflicts → Urgent Reassignments** to auto-reassign")
-                    else:
-                        st.success(result['message'])
-                else:
-                    st.error(result['message'])
-        
+        show_roster_update()
+
+@st.fragment
+def show_inventory_search():
+    """Find drones by criteria"""
+    st.subheader("Find Drones by Criteria")
+    
+    search_type = st.selectbox("Search by", ["Capability", "Location", "Status", "Maintenance Due"])
+    
+    if search_type == "Capability":
+        capabilities = ['LiDAR', 'RGB', 'Thermal']
+        selected_cap = st.selectbox("Select Capability", capabilities)
+        results = st.session_state.drone_inventory.get_drones_by_capability(selected_cap)
+        paged_dataframe(results, key="drone_search")
+    
+    elif search_type == "Location":
+        drones = get_drones_cached()
+        locations = drones['location'].cat.categories
+        selected_location = st.selectbox("Select Location", locations)
+        results = st.session_state.drone_inventory.get_drones_by_location(selected_location)
+        paged_dataframe(results, key="drone_search")
+    
+    elif search_type == "Status":
+        drones = get_drones_cached()
+        statuses = drones['status'].cat.categories
+        selected_status = st.selectbox("Select Status", statuses)
+        results = st.session_state.drone_inventory.get_drones_by_status(selected_status)
+        paged_dataframe(results, key="drone_search")
+    
+    elif search_type == "Maintenance Due":
+        maintenance = st.session_state.drone_inventory.get_maintenance_due_soon(30)
+        if maintenance:
+            df = pd.DataFrame(maintenance)
+            st.dataframe(fix_df_for_display(df), use_container_width=True)
         else:
-            if st.button(f"✅ Mark {new_status}"):
-                result = st.session_state.roster_manager.mark_pilot_available(pilot_id)
-                if result['success']:
-                    st.session_state.data_loader.save_pilots()
-                    st.success(result['message'])
-                else:
-                    st.error(result['message'])
+            st.info("No maintenance due in next 30 days")
+
+def apply_drone_edits(drone_ids):
+    """Apply rows changed in the drone editor, then flush them in one write"""
+    edited_rows = st.session_state.drone_editor['edited_rows']
+    for row, fields in edited_rows.items():
+        # Same as mark_drone_available/mark_drone_maintenance: the assignment is released
+        if 'status' in fields:
+            fields = {**fields, 'current_assignment': UNASSIGNED}
+        st.session_state.data_loader.update_drone(drone_ids[row], fields)
+    if edited_rows:
+        flush_data()
+
+@st.fragment
+def show_inventory_update():
+    """Update drone status"""
+    drones = get_drones_cached()
+    
+    st.subheader("Quick Edit")
+    st.caption("Edit status or location inline. Use the form below to deploy a drone to a mission.")
+    st.data_editor(
+        drones[['drone_id', 'model', 'status', 'location']].astype({'status': 'str', 'location': 'str'}),
+        key='drone_editor',
+        num_rows='fixed',
+        hide_index=True,
+        disabled=['drone_id', 'model'],
+        column_config={
+            'status': st.column_config.SelectboxColumn('status', options=['Available', 'Maintenance'])
+        },
+        on_change=apply_drone_edits,
+        args=(drones['drone_id'].tolist(),),
+        use_container_width=True
+    )
+    
+    st.subheader("Update Drone Status")
+    
+    drone_options = _drone_label_map(drones)
+    
+    drone_id = st.selectbox("Select Drone", list(drone_options), format_func=drone_options.get)
+    
+    new_status = st.selectbox("New Status", ["Available", "Deployed", "Maintenance"])
+    
+    if new_status == "Deployed":
+        missions = get_missions_cached()
+        mission_options = _mission_label_map(missions)
+        selected_mission = st.selectbox("Deploy to Mission", list(mission_options), format_func=mission_options.get)
+        
+        if st.button("✅ Deploy Drone"):
+            result = st.session_state.assignment_tracker.assign_drone_to_mission(drone_id, selected_mission)
+            if result['success']:
+                flush_data()
+                st.success(result['message'])
+            else:
+                st.error(result['message'])
+    
+    else:
+        if st.button(f"✅ Mark {new_status}"):
+            if new_status == "Maintenance":
+                result = st.session_state.drone_inventory.mark_drone_maintenance(drone_id)
+            else:
+                result = st.session_state.drone_inventory.mark_drone_available(drone_id)
+            if result['success']:
+                flush_data()
+                st.success(result['message'])
+            else:
+                st.error(result['message'])
 
 def show_inventory():
     st.title("🚁 Drone Inventory Management")
@@ -284,78 +678,92 @@ def show_inventory():
     
     with tab1:
         st.subheader("All Drones")
-        drones = st.session_state.data_loader.get_drones()
-        st.dataframe(fix_df_for_display(drones), use_container_width=True)
+        drones = get_drones_cached()
+        paged_dataframe(drones, key="drone_fleet")
     
     with tab2:
-        st.subheader("Find Drones by Criteria")
+        show_inventory_search()
+    
+    with tab3:
+        show_inventory_update()
+
+@st.fragment
+def show_mission_details():
+    """Show mission details with assigned resources"""
+    st.subheader("Mission Details")
+    missions = get_missions_cached()
+    project_options = _mission_label_map(missions)
+    
+    project_id = st.selectbox("Select Mission", list(project_options), format_func=project_options.get)
+    
+    details = get_mission_details_cached(project_id)
+    
+    if details:
+        col1, col2 = st.columns(2)
+        with col1:
+            st.write(f"**Client**: {details['client']}")
+            st.write(f"**Location**: {details['location']}")
+            st.write(f"**Priority**: {details['priority']}")
+        with col2:
+            st.write(f"**Start**: {details['start_date']}")
+            st.write(f"**End**: {details['end_date']}")
+            st.write(f"**Required Skills**: {details['required_skills']}")
+            st.write(f"**Required Certifications**: {details['required_certs']}")
         
-        search_type = st.selectbox("Search by", ["Capability", "Location", "Status", "Maintenance Due"])
+        st.divider()
         
-        if search_type == "Capability":
-            capabilities = ['LiDAR', 'RGB', 'Thermal']
-            selected_cap = st.selectbox("Select Capability", capabilities)
-            results = st.session_state.drone_inventory.get_drones_by_capability(selected_cap)
-            st.dataframe(fix_df_for_display(results), use_container_width=True)
+        if not details['assigned_pilots'].empty:
+            st.subheader("Assigned Pilots")
+            st.dataframe(fix_df_for_display(details['assigned_pilots']), use_container_width=True)
+        else:
+            st.info("No pilots assigned")
         
-        elif search_type == "Location":
-            drones = st.session_state.data_loader.get_drones()
-            locations = drones['location'].unique()
-            selected_location = st.selectbox("Select Location", locations)
-            results = st.session_state.drone_inventory.get_drones_by_location(selected_location)
-            st.dataframe(fix_df_for_display(results), use_container_width=True)
+        if not details['assigned_drones'].empty:
+            st.subheader("Assigned Drones")
+            st.dataframe(fix_df_for_display(details['assigned_drones']), use_container_width=True)
+        else:
+            st.info("No drones assigned")
+
+@st.fragment
+def show_reassignments():
+    """Reassign pilots or drones to missions"""
+    st.subheader("Reassign Resources")
+    
+    resource_type = st.selectbox("Resource Type", ["Pilot", "Drone"])
+    
+    if resource_type == "Pilot":
+        pilots = get_pilots_cached()
+        pilot_options = _pilot_label_map(pilots)
+        pilot_id = st.selectbox("Select Pilot", list(pilot_options), format_func=pilot_options.get)
         
-        elif search_type == "Status":
-            drones = st.session_state.data_loader.get_drones()
-            statuses = drones['status'].unique()
-            selected_status = st.selectbox("Select Status", statuses)
-            results = st.session_state.drone_inventory.get_drones_by_status(selected_status)
-            st.dataframe(fix_df_for_display(results), use_container_width=True)
+        missions = get_missions_cached()
+        project_options = _mission_label_map(missions)
+        new_mission = st.selectbox("Reassign to Mission", list(project_options), format_func=project_options.get)
         
-        elif search_type == "Maintenance Due":
-            maintenance = st.session_state.drone_inventory.get_maintenance_due_soon(30)
-            if maintenance:
-                df = pd.DataFrame(maintenance)
-                st.dataframe(fix_df_for_display(df), use_container_width=True)
+        if st.button("✅ Reassign Pilot"):
+            result = st.session_state.assignment_tracker.reassign_pilot(pilot_id, new_mission)
+            if result['success']:
+                flush_data()
+                st.success(result['message'])
             else:
-                st.info("No maintenance due in next 30 days")
+                st.error(result['message'])
     
-    with tab3:
-        st.subheader("Update Drone Status")
-        
-        drones = st.session_state.data_loader.get_drones()
-        drone_options = {row['drone_id']: f"{row['model']} ({row['drone_id']})" for _, row in drones.iterrows()}
-        
-        selected_drone = st.selectbox("Select Drone", list(drone_options.values()))
-        drone_id = selected_drone.split('(')[-1].rstrip(')')
+    else:
+        drones = get_drones_cached()
+        drone_options = _drone_label_map(drones)
+        drone_id = st.selectbox("Select Drone", list(drone_options), format_func=drone_options.get)
         
-        new_status = st.selectbox("New Status", ["Available", "Deployed", "Maintenance"])
+        missions = get_missions_cached()
+        project_options = _mission_label_map(missions)
+        new_mission = st.selectbox("Reassign to Mission", list(project_options), format_func=project_options.get)
         
-        if new_status == "Deployed":
-            missions = st.session_state.data_loader.get_missions()
-            mission_options = {row['project_id']: row['client'] for _, row in missions.iterrows()}
-            selected_mission = st.selectbox("Deploy to Mission", list(mission_options.keys()))
-            
-            if st.button("✅ Deploy Drone"):
-                result = st.session_state.assignment_tracker.assign_drone_to_mission(drone_id, selected_mission)
-                if result['success']:
-                    st.session_state.data_loader.save_drones()
-                    st.session_state.data_loader.save_missions()
-                    st.success(result['message'])
-                else:
-                    st.error(result['message'])
-        
-        else:
-            if st.button(f"✅ Mark {new_status}"):
-                if new_status == "Maintenance":
-                    result = st.session_state.drone_inventory.mark_drone_maintenance(drone_id)
-                else:
-                    result = st.session_state.drone_inventory.mark_drone_available(drone_id)
-                if result['success']:
-                    st.session_state.data_loader.save_drones()
-                    st.success(result['message'])
-                else:
-                    st.error(result['message'])
+        if st.button("✅ Reassign Drone"):
+            result = st.session_state.assignment_tracker.reassign_drone(drone_id, new_mission)
+            if result['success']:
+                flush_data()
+                st.success(result['message'])
+            else:
+                st.error(result['message'])
 
 def show_assignments():
     st.title("🔗 Assignment Tracking")
@@ -364,91 +772,105 @@ def show_assignments():
     
     with tab1:
         st.subheader("All Active Assignments")
-        assignments = st.session_state.assignment_tracker.get_active_assignments()
-        if assignments:
-            df = pd.DataFrame(assignments)
-            st.dataframe(fix_df_for_display(df), use_container_width=True)
+        assignments = get_assignments_cached()
+        if not assignments.empty:
+            st.dataframe(fix_df_for_display(assignments), use_container_width=True)
         else:
             st.info("No active assignments")
     
     with tab2:
-        st.subheader("Mission Details")
-        missions = st.session_state.data_loader.get_missions()
-        project_options = {row['project_id']: f"{row['client']} ({row['project_id']})" for _, row in missions.iterrows()}
-        
-        selected_mission = st.selectbox("Select Mission", list(project_options.values()))
-        project_id = selected_mission.split('(')[-1].rstrip(')')
-        
-        details = st.session_state.assignment_tracker.get_mission_details_with_assignments(project_id)
-        
-        if details:
-            col1, col2 = st.columns(2)
-            with col1:
-                st.write(f"**Client**: {details['client']}")
-                st.write(f"**Location**: {details['location']}")
-                st.write(f"**Priority**: {details['priority']}")
-            with col2:
-                st.write(f"**Start**: {details['start_date']}")
-                st.write(f"**End**: {details['end_date']}")
-                st.write(f"**Required Skills**: {details['required_skills']}")
-                st.write(f"**Required Certifications**: {details['required_certs']}")
-            
-            st.divider()
-            
-            if details['assigned_pilots']:
-                st.subheader("Assigned Pilots")
-                st.dataframe(fix_df_for_display(pd.DataFrame(details['assigned_pilots'])), use_container_width=True)
-            else:
-                st.info("No pilots assigned")
-            
-            if details['assigned_drones']:
-                st.subheader("Assigned Drones")
-                st.dataframe(fix_df_for_display(pd.DataFrame(details['assigned_drones'])), use_container_width=True)
-            else:
-                st.info("No drones assigned")
+        show_mission_details()
     
     with tab3:
-        st.subheader("Reassign Resources")
-        
-        resource_type = st.selectbox("Resource Type", ["Pilot", "Drone"])
+        show_reassignments()
+
+@st.fragment
+def show_conflicts_by_type():
+    """Filter conflicts by type"""
+    st.subheader("Filter by Conflict Type")
+    
+    conflicts_by_type = get_conflicts_by_type_cached()
+    
+    selected_type = st.selectbox("Conflict Type", sorted(conflicts_by_type))
+    
+    filtered = conflicts_by_type.get(selected_type)
+    
+    if filtered is not None:
+        st.dataframe(fix_df_for_display(filtered), use_container_width=True)
+    else:
+        st.info(f"No {selected_type} conflicts")
+
+@st.fragment
+def show_urgent_reassignments():
+    """Show urgent reassignments for critical conflicts"""
+    st.subheader("🚨 Urgent Reassignments")
+    
+    critical_conflicts = get_conflict_analysis_cached()['critical']
+    
+    if critical_conflicts:
+        st.warning(f"**{len(critical_conflicts)} critical issues require urgent attention**")
         
-        if resource_type == "Pilot":
-            pilots = st.session_state.data_loader.get_pilots()
-            pilot_options = {row['pilot_id']: f"{row['name']} ({row['pilot_id']})" for _, row in pilots.iterrows()}
-            selected_pilot = st.selectbox("Select Pilot", list(pilot_options.values()))
-            pilot_id = selected_pilot.split('(')[-1].rstrip(')')
-            
-            missions = st.session_state.data_loader.get_missions()
-            project_options = {row['project_id']: f"{row['client']} ({row['project_id']})" for _, row in missions.iterrows()}
-            new_mission = st.selectbox("Reassign to Mission", list(project_options.keys()))
-            
-            if st.button("✅ Reassign Pilot"):
-                result = st.session_state.assignment_tracker.reassign_pilot(pilot_id, new_mission)
-                if result['success']:
-                    st.session_state.data_loader.save_pilots()
-                    st.session_state.data_loader.save_missions()
-                    st.success(result['message'])
+        # AUTO-REASSIGN BUTTON
+        st.divider()
+        col1, col2 = st.columns([2, 1])
+        with col1:
+            st.write("**🤖 Automatic Reassignment**: Let the system find and assign best available pilots/drones")
+        with col2:
+            if st.button("⚡ Auto-Reassign All", type="primary"):
+                results = st.session_state.conflict_detector.auto_reassign_urgent_conflicts(
+                    st.session_state.roster_manager
+                )
+                
+                if results:
+                    flush_data()
+                    
+                    for r in results:
+                        if r['status'] == 'SUCCESS':
+                            st.success(r['message'])
+                        else:
+                            st.error(r['message'])
+                    
+                    st.rerun()
                 else:
-                    st.error(result['message'])
+                    st.info("No urgent conflicts to reassign")
         
-        else:
-            drones = st.session_state.data_loader.get_drones()
-            drone_options = {row['drone_id']: f"{row['model']} ({row['drone_id']})" for _, row in drones.iterrows()}
-            selected_drone = st.selectbox("Select Drone", list(drone_options.values()))
-            drone_id = selected_drone.split('(')[-1].rstrip(')')
-            
-            missions = st.session_state.data_loader.get_missions()
-            project_options = {row['project_id']: f"{row['client']} ({row['project_id']})" for _, row in missions.iterrows()}
-            new_mission = st.selectbox("Reassign to Mission", list(project_options.keys()))
-            
-            if st.button("✅ Reassign Drone"):
-                result = st.session_state.assignment_tracker.reassign_drone(drone_id, new_mission)
-                if result['success']:
-                    st.session_state.data_loader.save_drones()
-                    st.session_state.data_loader.save_missions()
-                    st.success(result['message'])
-                else:
-                    st.error(result['message'])
+        st.divider()
+        
+        # Show each conflict with details
+        for conflict in critical_conflicts:
+            with st.expander(f"{conflict['type']}: {conflict['issue']}", expanded=False):
+                if 'pilot_id' in conflict:
+                    pilot_id = conflict['pilot_id']
+                    current_mission = conflict.get('assignment', 'Unknown')
+                    
+                    st.write(f"**Current Assignment**: {current_mission}")
+                    
+                    # Find best replacement
+                    best_replacement = st.session_state.conflict_detector.find_best_replacement_pilot(current_mission)
+                    if best_replacement is not None:
+                        st.write(f"**🎯 Recommended Replacement**: {best_replacement['name']} ({best_replacement['pilot_id']})")
+                        st.write(f"   - Skills: {best_replacement['skills']}")
+                        st.write(f"   - Certifications: {best_replacement['certifications']}")
+                    
+                    # Get all available alternatives
+                    available_pilots = st.session_state.roster_manager.get_available_pilots()
+                    if len(available_pilots) > 0:
+                        st.write("**All Available Pilots**:")
+                        st.dataframe(available_pilots[['pilot_id', 'name', 'skills', 'certifications', 'location']], use_container_width=True)
+                
+                if 'drone_id' in conflict:
+                    drone_id = conflict['drone_id']
+                    current_mission = conflict.get('assignment', 'Unknown')
+                    
+                    st.write(f"**Current Assignment**: {current_mission}")
+                    
+                    # Get available alternatives
+                    available_drones = st.session_state.drone_inventory.get_available_drones()
+                    if len(available_drones) > 0:
+                        st.write("**Available Drones to Reassign**:")
+                        st.dataframe(available_drones[['drone_id', 'model', 'capabilities', 'location']], use_container_width=True)
+    else:
+        st.success("✅ No critical issues requiring urgent action")
 
 def show_conflicts():
     st.title("⚠️ Conflict Detection & Resolution")
@@ -457,10 +879,11 @@ def show_conflicts():
     
     with tab1:
         st.subheader("Detected Conflicts")
-        conflicts = st.session_state.conflict_detector.get_all_conflicts()
+        analysis = get_conflict_analysis_cached()
+        summary = analysis['summary']
+        conflicts = analysis['all']
         
         if conflicts:
-            summary = st.session_state.conflict_detector.get_conflicts_summary()
             
             col1, col2, col3, col4 = st.columns(4)
             with col1:
@@ -486,92 +909,10 @@ def show_conflicts():
             st.success("✅ No conflicts detected!")
     
     with tab2:
-        st.subheader("Filter by Conflict Type")
-        
-        conflict_types = set()
-        for conflict in st.session_state.conflict_detector.get_all_conflicts():
-            conflict_types.add(conflict['type'])
-        
-        selected_type = st.selectbox("Conflict Type", sorted(conflict_types))
-        
-        filtered = [c for c in st.session_state.conflict_detector.get_all_conflicts() if c['type'] == selected_type]
-        
-        if filtered:
-            st.dataframe(fix_df_for_display(pd.DataFrame(filtered)), use_container_width=True)
-        else:
-            st.info(f"No {selected_type} conflicts")
+        show_conflicts_by_type()
     
     with tab3:
-        st.subheader("🚨 Urgent Reassignments")
-        
-        conflicts = st.session_state.conflict_detector.get_all_conflicts()
-        critical_conflicts = [c for c in conflicts if c['severity'] in ['CRITICAL', 'HIGH']]
-        
-        if critical_conflicts:
-            st.warning(f"**{len(critical_conflicts)} critical issues require urgent attention**")
-            
-            # AUTO-REASSIGN BUTTON
-            st.divider()
-            col1, col2 = st.columns([2, 1])
-            with col1:
-                st.write("**🤖 Automatic Reassignment**: Let the system find and assign best available pilots/drones")
-            with col2:
-                if st.button("⚡ Auto-Reassign All", type="primary"):
-                    results = st.session_state.conflict_detector.auto_reassign_urgent_conflicts(
-                        st.session_state.roster_manager
-                    )
-                    
-                    if results:
-                        st.session_state.data_loader.save_pilots()
-                        st.session_state.data_loader.save_missions()
-                        
-                        for r in results:
-                            if r['status'] == 'SUCCESS':
-                                st.success(r['message'])
-                            else:
-                                st.error(r['message'])
-                        
-                        st.rerun()
-                    else:
-                        st.info("No urgent conflicts to reassign")
-            
-            st.divider()
-            
-            # Show each conflict with details
-            for conflict in critical_conflicts:
-                with st.expander(f"{conflict['type']}: {conflict['issue']}", expanded=False):
-                    if 'pilot_id' in conflict:
-                        pilot_id = conflict['pilot_id']
-                        current_mission = conflict.get('assignment', 'Unknown')
-                        
-                        st.write(f"**Current Assignment**: {current_mission}")
-                        
-                        # Find best replacement
-                        best_replacement = st.session_state.conflict_detector.find_best_replacement_pilot(current_mission)
-                        if best_replacement is not None:
-                            st.write(f"**🎯 Recommended Replacement**: {best_replacement['name']} ({best_replacement['pilot_id']})")
-                            st.write(f"   - Skills: {best_replacement['skills']}")
-                            st.write(f"   - Certifications: {best_replacement['certifications']}")
-                        
-                        # Get all available alternatives
-                        available_pilots = st.session_state.roster_manager.get_available_pilots()
-                        if len(available_pilots) > 0:
-                            st.write("**All Available Pilots**:")
-                            st.dataframe(available_pilots[['pilot_id', 'name', 'skills', 'certifications', 'location']], use_container_width=True)
-                    
-                    if 'drone_id' in conflict:
-                        drone_id = conflict['drone_id']
-                        current_mission = conflict.get('assignment', 'Unknown')
-                        
-                        st.write(f"**Current Assignment**: {current_mission}")
-                        
-                        # Get available alternatives
-                        available_drones = st.session_state.drone_inventory.get_available_drones()
-                        if len(available_drones) > 0:
-                            st.write("**Available Drones to Reassign**:")
-                            st.dataframe(available_drones[['drone_id', 'model', 'capabilities', 'location']], use_container_width=True)
-        else:
-            st.success("✅ No critical issues requiring urgent action")
+        show_urgent_reassignments()
 
 def show_chat():
     st.title("💬 Chat Assistant")
@@ -596,21 +937,16 @@ def show_chat():
             st.markdown(user_input)
         
         # Get context for LLM
-        pilots = st.session_state.data_loader.get_pilots()
-        drones = st.session_state.data_loader.get_drones()
+        context = get_chat_context_cached()
         
-        context = f"""
-Current System State:
-- Total Pilots: {len(pilots)} ({len(pilots[pilots['status'] == 'Available'])} available)
-- Total Drones: {len(drones)} ({len(drones[drones['status'] == 'Available'])} available)
-- Active Assignments: {len(st.session_state.assignment_tracker.get_active_assignments())}
-- Detected Conflicts: {st.session_state.conflict_detector.get_conflicts_summary()['total_conflicts']}
-"""
+        # Per-user: the LLM handler keeps this session's conversation history
+        if 'llm_handler' not in st.session_state:
+            from utils.llm_handler import LLMHandler
+            st.session_state.llm_handler = LLMHandler()
         
         # Get response from Claude
         with st.chat_message("assistant"):
-            response = st.session_state.llm_handler.chat(user_input, context)
-            st.markdown(response)
+            response = st.write_stream(st.session_state.llm_handler.stream(user_input, context))
         
         # Add assistant message
         st.session_state.messages.append({"role": "assistant", "content": response})
@@ -625,8 +961,23 @@ def show_settings():
         st.info("Settings for Skylark Drone Operations Coordinator")
         
         if st.button("🔄 Reload Data"):
-            st.session_state.data_loader = DataLoader()
-            st.success("Data reloaded!")
+            data_loader = st.session_state.data_loader
+            # Write edits still waiting for the debounced flush first, reloading would drop them.
+            # Reload in place so the shared managers keep pointing at the same loader
+            with data_loader.lock:
+                flushed = data_loader.flush_pending()
+                if flushed:
+                    data_loader.load_all_data()
+            if flushed:
+                st.success("Data reloaded!")
+            else:
+                st.error("Could not save pending changes, data was not reloaded")
+        
+        if st.button("📤 Export CSV"):
+            if st.session_state.data_loader.export_csv():
+                st.success("Exported pilot_roster.csv, drone_fleet.csv and missions.csv")
+            else:
+                st.error("CSV export failed")
     
     with tab2:
         st.subheader("Google Sheets Integration")
@@ -637,22 +988,27 @@ def show_settings():
         
         credentials_json = st.text_area("Google Service Account JSON", placeholder="Paste your service account JSON here")
         
+        upload_on_connect = st.checkbox("Upload local data on connect", help="Overwrites the Pilot Roster and Drone Fleet sheets in one batch update")
+        
         if st.button("🔗 Connect to Google Sheets"):
             if spreadsheet_id and credentials_json:
+                from utils.sheets_sync import GoogleSheetsSync
                 sheets_sync = GoogleSheetsSync(credentials_json)
                 if sheets_sync.authenticate(credentials_json):
                     if sheets_sync.open_spreadsheet(spreadsheet_id):
                         st.session_state.sheets_sync = sheets_sync
                         st.success("✅ Connected to Google Sheets!")
                         
-                        # Sync data
-                        pilots = st.session_state.data_loader.get_pilots()
-                        drones = st.session_state.data_loader.get_drones()
-                        
-                        result1 = sheets_sync.sync_pilots_to_sheet(pilots)
-                        result2 = sheets_sync.sync_drones_to_sheet(drones)
-                        
-                        st.info(f"{result1['message']}\n{result2['message']}")
+                        # Full-table upload is opt-in since it rewrites both sheets
+                        if upload_on_connect:
+                            result = sheets_sync.upload_all({
+                                'pilots': get_pilots_cached(),
+                                'drones': get_drones_cached()
+                            })
+                            if result['success']:
+                                st.info(result['message'])
+                            else:
+                                st.error(result['message'])
                     else:
                         st.error("Could not open spreadsheet")
                 else:
@@ -1,5 +1,11 @@
+import pandas as pd
 from datetime import datetime
 
+from modules.data_loader import UNASSIGNED, split_items, item_set
+
+# Returned by data_loader.lookup for unknown ids, so it can't be confused with an empty cell
+NOT_FOUND = object()
+
 class AssignmentTracker:
     """Track and manage pilot/drone assignments to missions"""
     
@@ -10,44 +16,38 @@ class AssignmentTracker:
     
     def get_active_assignments(self):
         """Get all active assignments (pilots and drones)"""
-        pilots = self.data_loader.get_pilots()
-        drones = self.data_loader.get_drones()
-        
-        pilot_assignments = []
-        drone_assignments = []
+        pilots = self.data_loader.get_pilots_view()
+        drones = self.data_loader.get_drones_view()
         
         # Get pilot assignments
-        for idx, pilot in pilots.iterrows():
-            if pilot['current_assignment'] != '–':
-                pilot_assignments.append({
-                    'type': 'Pilot',
-                    'id': pilot['pilot_id'],
-                    'name': pilot['name'],
-                    'assignment': pilot['current_assignment'],
-                    'status': pilot['status']
-                })
+        pilot_assignments = pilots[pilots['current_assignment'].values != UNASSIGNED][
+            ['pilot_id', 'name', 'current_assignment', 'status']
+        ].rename(columns={'pilot_id': 'id', 'current_assignment': 'assignment'})
+        pilot_assignments.insert(0, 'type', 'Pilot')
         
         # Get drone assignments
-        for idx, drone in drones.iterrows():
-            if drone['current_assignment'] != '–':
-                drone_assignments.append({
-                    'type': 'Drone',
-                    'id': drone['drone_id'],
-                    'model': drone['model'],
-                    'assignment': drone['current_assignment'],
-                    'status': drone['status']
-                })
-        
-        return pilot_assignments + drone_assignments
+        drone_assignments = drones[drones['current_assignment'].values != UNASSIGNED][
+            ['drone_id', 'model', 'current_assignment', 'status']
+        ].rename(columns={'drone_id': 'id', 'current_assignment': 'assignment'})
+        drone_assignments.insert(0, 'type', 'Drone')
+        
+        return pilot_assignments.to_dict('records') + drone_assignments.to_dict('records')
     
-    def get_mission_details_with_assignments(self, project_id):
+    def get_mission_details_with_assignments(self, project_id, missions_by_id=None, pilots=None, drones=None):
         """Get mission details with assigned pilots and drones"""
-        mission = self.data_loader.get_mission_by_id(project_id)
+        # Callers that already hold the frames can pass missions indexed by
+        # unique project_id and pilots/drones to skip the lookups and copies
+        if missions_by_id is not None:
+            mission = missions_by_id.loc[project_id] if project_id in missions_by_id.index else None
+        else:
+            mission = self.data_loader.get_mission_by_id(project_id)
         if mission is None:
             return None
         
-        pilots = self.data_loader.get_pilots()
-        drones = self.data_loader.get_drones()
+        if pilots is None:
+            pilots = self.data_loader.get_pilots_view()
+        if drones is None:
+            drones = self.data_loader.get_drones_view()
         
         assigned_pilots = pilots[pilots['current_assignment'] == project_id]
         assigned_drones = drones[drones['current_assignment'] == project_id]
@@ -67,15 +67,17 @@ class AssignmentTracker:
     
     def assign_pilot_to_mission(self, pilot_id, project_id):
         """Assign pilot to a mission with validation"""
-        pilot = self.data_loader.get_pilot_by_id(pilot_id)
-        mission = self.data_loader.get_mission_by_id(project_id)
-        
-        if pilot is None or mission is None:
+        # Existence and availability are checked on single cells, full rows are only built when needed
+        status = self.data_loader.lookup('pilots', pilot_id, 'status', default=NOT_FOUND)
+        if status is NOT_FOUND or self.data_loader.lookup('missions', project_id, 'project_id', default=NOT_FOUND) is NOT_FOUND:
             return {'success': False, 'message': 'Pilot or Mission not found'}
         
         # Check availability
-        if pilot['status'] != 'Available':
-            return {'success': False, 'message': f"❌ Pilot {pilot['name']} is {pilot['status']} - cannot assign"}
+        if status != 'Available':
+            return {'success': False, 'message': f"❌ Pilot {self.data_loader.lookup('pilots', pilot_id, 'name')} is {status} - cannot assign"}
+        
+        pilot = self.data_loader.get_pilot_by_id(pilot_id)
+        mission = self.data_loader.get_mission_by_id(project_id)
         
         # Check location match - BLOCK (Critical - always required)
         if pilot['location'].strip() != mission['location'].strip():
@@ -87,8 +89,8 @@ class AssignmentTracker:
         warnings = []
         
         # Check skills match (case-insensitive)
-        required_skills = [s.strip().lower() for s in str(mission['required_skills']).split(',')]
-        pilot_skills = [s.strip().lower() for s in str(pilot['skills']).split(',')]
+        required_skills = split_items(str(mission['required_skills']).lower())
+        pilot_skills = item_set(str(pilot['skills']).lower())
         missing_skills = [s for s in required_skills if s not in pilot_skills]
         
         if len(missing_skills) > 1:
@@ -102,8 +104,8 @@ class AssignmentTracker:
             warnings.append(f"⚠️ Pilot lacks skill: '{missing_skills[0]}'")
         
         # Check certifications match (case-insensitive)
-        required_certs = [c.strip().lower() for c in str(mission['required_certs']).split(',')]
-        pilot_certs = [c.strip().lower() for c in str(pilot['certifications']).split(',')]
+        required_certs = split_items(str(mission['required_certs']).lower())
+        pilot_certs = item_set(str(pilot['certifications']).lower())
         missing_certs = [c for c in required_certs if c not in pilot_certs]
         
         if len(missing_certs) > 1:
@@ -129,15 +131,16 @@ class AssignmentTracker:
     
     def assign_drone_to_mission(self, drone_id, project_id):
         """Assign drone to a mission with validation"""
-        drone = self.data_loader.get_drone_by_id(drone_id)
-        mission = self.data_loader.get_mission_by_id(project_id)
-        
-        if drone is None or mission is None:
+        status = self.data_loader.lookup('drones', drone_id, 'status', default=NOT_FOUND)
+        if status is NOT_FOUND or self.data_loader.lookup('missions', project_id, 'project_id', default=NOT_FOUND) is NOT_FOUND:
             return {'success': False, 'message': 'Drone or Mission not found'}
         
         # Check availability
-        if drone['status'] != 'Available':
-            return {'success': False, 'message': f"❌ Drone {drone_id} is {drone['status']} - cannot deploy"}
+        if status != 'Available':
+            return {'success': False, 'message': f"❌ Drone {drone_id} is {status} - cannot deploy"}
+        
+        drone = self.data_loader.get_drone_by_id(drone_id)
+        mission = self.data_loader.get_mission_by_id(project_id)
         
         # Check location match
         if drone['location'] != mission['location']:
@@ -147,8 +150,8 @@ class AssignmentTracker:
             }
         
         # Check if drone capabilities match required skills (if applicable)
-        required_skills = [s.strip().lower() for s in str(mission['required_skills']).split(',')]
-        drone_capabilities = [c.strip().lower() for c in str(drone['capabilities']).split(',')]
+        required_skills = split_items(str(mission['required_skills']).lower())
+        drone_capabilities = item_set(str(drone['capabilities']).lower())
         
         # Check for thermal/lidar requirements
         if 'thermal' in required_skills and 'thermal' not in drone_capabilities:
@@ -158,7 +161,6 @@ class AssignmentTracker:
             }
         
         # Check maintenance due date
-        import pandas as pd
         if pd.to_datetime(drone['maintenance_due']) <= pd.to_datetime(mission['end_date']):
             return {
                 'success': False,
@@ -185,8 +187,8 @@ class AssignmentTracker:
             }
         
         # Check skills match
-        required_skills = [s.strip() for s in str(new_mission['required_skills']).split(',')]
-        pilot_skills = [s.strip() for s in str(pilot['skills']).split(',')]
+        required_skills = split_items(new_mission['required_skills'])
+        pilot_skills = item_set(pilot['skills'])
         missing_skills = [s for s in required_skills if s not in pilot_skills]
         if missing_skills:
             return {
@@ -195,8 +197,8 @@ class AssignmentTracker:
             }
         
         # Check certifications match
-        required_certs = [c.strip() for c in str(new_mission['required_certs']).split(',')]
-        pilot_certs = [c.strip() for c in str(pilot['certifications']).split(',')]
+        required_certs = split_items(new_mission['required_certs'])
+        pilot_certs = item_set(pilot['certifications'])
         missing_certs = [c for c in required_certs if c not in pilot_certs]
         if missing_certs:
             return {
@@ -234,7 +236,6 @@ class AssignmentTracker:
             }
         
         # Check maintenance due date
-        import pandas as pd
         if pd.to_datetime(drone['maintenance_due']) <= pd.to_datetime(new_mission['end_date']):
             return {
                 'success': False,
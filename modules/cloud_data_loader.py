@@ -1,82 +1,80 @@
 import pandas as pd
-from datetime import datetime
-import os
-import json
+from contextlib import nullcontext
 
-class CloudDataLoader:
+from modules.data_loader import DataLoader
+
+# Per table: id column, GoogleSheetsSync sheet getter and date columns, for row-level sheet writes
+SHEET_TABLES = {
+    'pilots': ('pilot_id', 'get_pilot_sheet', ['available_from']),
+    'drones': ('drone_id', 'get_drone_sheet', ['maintenance_due']),
+    'missions': ('project_id', 'get_mission_sheet', ['start_date', 'end_date'])
+}
+
+class CloudDataLoader(DataLoader):
     """
     Smart data loader that works with:
-    - CSV files (local development)
+    - Local Parquet files, seeded from CSV (local development)
     - Google Sheets (deployed/production)
     
     Automatically detects which backend to use based on environment.
     """
     
     def __init__(self, data_dir=".", use_sheets=False, sheets_sync=None):
-        self.data_dir = data_dir
         self.use_sheets = use_sheets
         self.sheets_sync = sheets_sync
+        self._sheet_columns = {}  # Header each sheet is known to have, row-level writes need it to match
         
-        self.pilots_df = None
-        self.drones_df = None
-        self.missions_df = None
-        
-        self.load_all_data()
+        # Files, indexes, lookups and row updates are DataLoader's; this class adds the Sheets backend
+        super().__init__(data_dir)
     
-    def load_all_data(self):
+    def _load_tables(self):
         """Load all data from appropriate source"""
+        self._sheet_columns = {}
         if self.use_sheets and self.sheets_sync:
             self._load_from_sheets()
         else:
-            self._load_from_csv()
-    
-    def _load_from_csv(self):
-        """Load data from CSV files"""
-        try:
-            self.pilots_df = pd.read_csv(os.path.join(self.data_dir, "pilot_roster.csv"))
-            self.drones_df = pd.read_csv(os.path.join(self.data_dir, "drone_fleet.csv"))
-            self.missions_df = pd.read_csv(os.path.join(self.data_dir, "missions.csv"))
-            
-            self._parse_dates()
-            
-        except FileNotFoundError as e:
-            raise Exception(f"Data file not found: {e}")
-        except Exception as e:
-            raise Exception(f"Error loading data: {e}")
+            self._load_from_files()
     
     def _load_from_sheets(self):
         """Load data from Google Sheets"""
         try:
+            # One batched read for all three sheets, a failed read falls back to local files
+            sheets = self.sheets_sync.read_all_from_sheets() or {}
+            
             # Load pilots from sheet
-            pilots_data = self.sheets_sync.read_pilots_from_sheet()
+            pilots_data = sheets.get('pilots')
             if pilots_data is not None and not pilots_data.empty:
                 self.pilots_df = pilots_data
+                self._sheet_columns['pilots'] = list(pilots_data.columns)
             else:
-                # Fallback to CSV if sheet is empty
-                self.pilots_df = pd.read_csv(os.path.join(self.data_dir, "pilot_roster.csv"))
+                # Fallback to local files if sheet is empty
+                self.pilots_df = self._read("pilot_roster")
             
             # Load drones from sheet
-            drones_data = self.sheets_sync.read_drones_from_sheet()
+            drones_data = sheets.get('drones')
             if drones_data is not None and not drones_data.empty:
                 self.drones_df = drones_data
+                self._sheet_columns['drones'] = list(drones_data.columns)
             else:
-                self.drones_df = pd.read_csv(os.path.join(self.data_dir, "drone_fleet.csv"))
+                self.drones_df = self._read("drone_fleet")
             
             # Load missions from sheet
-            missions_data = self.sheets_sync.read_missions_from_sheet()
+            missions_data = sheets.get('missions')
             if missions_data is not None and not missions_data.empty:
                 self.missions_df = missions_data
+                self._sheet_columns['missions'] = list(missions_data.columns)
             else:
-                self.missions_df = pd.read_csv(os.path.join(self.data_dir, "missions.csv"))
+                self.missions_df = self._read("missions")
             
             self._parse_dates()
             
         except Exception as e:
-            print(f"Error loading from sheets, falling back to CSV: {e}")
-            self._load_from_csv()
+            print(f"Error loading from sheets, falling back to local files: {e}")
+            self._sheet_columns = {}
+            self._load_from_files()
     
     def _parse_dates(self):
-        """Parse date columns"""
+        """Parse date columns and store low-cardinality columns as categoricals"""
         try:
             self.pilots_df['available_from'] = pd.to_datetime(self.pilots_df['available_from'])
             self.drones_df['maintenance_due'] = pd.to_datetime(self.drones_df['maintenance_due'])
@@ -84,138 +82,111 @@ class CloudDataLoader:
             self.missions_df['end_date'] = pd.to_datetime(self.missions_df['end_date'])
         except Exception as e:
             print(f"Warning: Date parsing issue: {e}")
-    
-    def get_pilots(self):
-        """Return pilots dataframe"""
-        return self.pilots_df.copy()
-    
-    def get_drones(self):
-        """Return drones dataframe"""
-        return self.drones_df.copy()
-    
-    def get_missions(self):
-        """Return missions dataframe"""
-        return self.missions_df.copy()
-    
-    def get_pilot_by_id(self, pilot_id):
-        """Get specific pilot by ID"""
-        result = self.pilots_df[self.pilots_df['pilot_id'] == pilot_id]
-        return result.iloc[0] if not result.empty else None
-    
-    def get_drone_by_id(self, drone_id):
-        """Get specific drone by ID"""
-        result = self.drones_df[self.drones_df['drone_id'] == drone_id]
-        return result.iloc[0] if not result.empty else None
-    
-    def get_mission_by_id(self, project_id):
-        """Get specific mission by ID"""
-        result = self.missions_df[self.missions_df['project_id'] == project_id]
-        return result.iloc[0] if not result.empty else None
-    
-    def update_pilot_status(self, pilot_id, new_status, current_assignment=None, available_from=None):
-        """Update pilot status in dataframe"""
-        idx = self.pilots_df[self.pilots_df['pilot_id'] == pilot_id].index
-        if len(idx) > 0:
-            self.pilots_df.loc[idx[0], 'status'] = new_status
-            if current_assignment:
-                self.pilots_df.loc[idx[0], 'current_assignment'] = current_assignment
-            if available_from:
-                self.pilots_df.loc[idx[0], 'available_from'] = available_from
-            return True
-        return False
-    
-    def update_drone_status(self, drone_id, new_status, current_assignment=None):
-        """Update drone status in dataframe"""
-        idx = self.drones_df[self.drones_df['drone_id'] == drone_id].index
-        if len(idx) > 0:
-            self.drones_df.loc[idx[0], 'status'] = new_status
-            if current_assignment:
-                self.drones_df.loc[idx[0], 'current_assignment'] = current_assignment
-            return True
-        return False
-    
-    def update_mission_assignment(self, project_id, pilot_id=None, drone_id=None):
-        """Update mission with assigned pilot and/or drone"""
-        idx = self.missions_df[self.missions_df['project_id'] == project_id].index
-        if len(idx) > 0:
-            if pilot_id:
-                self.missions_df.loc[idx[0], 'assigned_pilot'] = pilot_id
-            if drone_id:
-                self.missions_df.loc[idx[0], 'assigned_drone'] = drone_id
-            return True
-        return False
+        self._to_categories()
     
     # ============ SAVE METHODS ============
     
     def save_pilots(self):
         """Save pilots to appropriate backend"""
         if self.use_sheets and self.sheets_sync:
-            return self._save_pilots_to_sheets()
-        else:
-            return self._save_pilots_to_csv()
+            with self.lock:
+                return self._save_pilots_to_sheets()
+        return super().save_pilots()
     
     def save_drones(self):
         """Save drones to appropriate backend"""
         if self.use_sheets and self.sheets_sync:
-            return self._save_drones_to_sheets()
-        else:
-            return self._save_drones_to_csv()
+            with self.lock:
+                return self._save_drones_to_sheets()
+        return super().save_drones()
     
     def save_missions(self):
         """Save missions to appropriate backend"""
         if self.use_sheets and self.sheets_sync:
-            return self._save_missions_to_sheets()
-        else:
-            return self._save_missions_to_csv()
+            with self.lock:
+                return self._save_missions_to_sheets()
+        return super().save_missions()
     
     def save_all(self):
         """Save all data"""
-        return self.save_pilots() and self.save_drones() and self.save_missions()
-    
-    # ============ CSV SAVE METHODS ============
-    
-    def _save_pilots_to_csv(self):
-        """Save pilots dataframe to CSV"""
-        try:
-            df_to_save = self.pilots_df.copy()
-            df_to_save['available_from'] = df_to_save['available_from'].dt.strftime('%Y-%m-%d')
-            df_to_save.to_csv(os.path.join(self.data_dir, "pilot_roster.csv"), index=False)
-            return True
-        except Exception as e:
-            print(f"Error saving pilots to CSV: {e}")
-            return False
+        if not (self.use_sheets and self.sheets_sync):
+            return super().save_all()
+        
+        # The three sheet syncs are queued and sent as one batch update
+        with self.lock:
+            with self.sheets_sync.begin_batch() as batch:
+                results = [self.save_pilots(), self.save_drones(), self.save_missions()]
+            if not batch['success']:
+                print(f"Error saving to sheets: {batch['message']}")
+                self._sheet_columns = {}
+                return False
+            return all(results)
+    
+    def flush_pending(self):
+        """Save rows edited since the last flush (just those rows when the sheet layout matches)"""
+        with self.lock:
+            use_sheets = self.use_sheets and self.sheets_sync
+            success = True
+            queued = {}  # table -> ids whose whole-table write only went out with the batch
+            # Whole-table fallbacks are queued and sent together when the batch closes
+            with self.sheets_sync.begin_batch() if use_sheets else nullcontext() as batch:
+                for table, ids in self._dirty.items():
+                    if not ids:
+                        continue
+                    self._dirty[table] = set()
+                    columns = list(getattr(self, f"{table}_df").columns)
+                    if use_sheets and self._sheet_columns.get(table) == columns:
+                        saved = self._save_rows_to_sheets(table, ids)
+                    else:
+                        saved = getattr(self, f"save_{table}")()
+                        if saved and use_sheets:
+                            queued[table] = ids
+                    if not saved:
+                        # Keep the rows dirty so the next flush retries them
+                        self._dirty[table] |= ids
+                        success = False
+            if batch is not None and not batch['success']:
+                print(f"Error flushing to sheets: {batch['message']}")
+                # The queued tables never reached the sheet, keep them dirty for the next flush
+                for table, ids in queued.items():
+                    self._dirty[table] |= ids
+                # Sheet headers are unknown now, so the next flush rewrites whole tables
+                self._sheet_columns = {}
+                success = False
+            return success
     
-    def _save_drones_to_csv(self):
-        """Save drones dataframe to CSV"""
-        try:
-            df_to_save = self.drones_df.copy()
-            df_to_save['maintenance_due'] = df_to_save['maintenance_due'].dt.strftime('%Y-%m-%d')
-            df_to_save.to_csv(os.path.join(self.data_dir, "drone_fleet.csv"), index=False)
-            return True
-        except Exception as e:
-            print(f"Error saving drones to CSV: {e}")
-            return False
+    # ============ GOOGLE SHEETS SAVE METHODS ============
     
-    def _save_missions_to_csv(self):
-        """Save missions dataframe to CSV"""
+    def _save_rows_to_sheets(self, table, ids):
+        """Overwrite only the sheet rows of the given ids"""
         try:
-            df_to_save = self.missions_df.copy()
-            df_to_save['start_date'] = df_to_save['start_date'].dt.strftime('%Y-%m-%d')
-            df_to_save['end_date'] = df_to_save['end_date'].dt.strftime('%Y-%m-%d')
-            df_to_save.to_csv(os.path.join(self.data_dir, "missions.csv"), index=False)
-            return True
+            id_col, get_sheet, date_cols = SHEET_TABLES[table]
+            df = getattr(self, f"{table}_df")
+            mask = df[id_col].isin(ids).to_numpy()
+            df_to_save = df[mask].copy()
+            for col in date_cols:
+                df_to_save[col] = df_to_save[col].dt.strftime('%Y-%m-%d')
+            
+            # Sheet rows follow the dataframe order, after the header row
+            rows = [
+                (position + 2, [str(val) for val in row])
+                for position, row in zip(mask.nonzero()[0], df_to_save.to_numpy(dtype=object).tolist())
+            ]
+            sheet = getattr(self.sheets_sync, get_sheet)()
+            result = self.sheets_sync.update_rows({sheet.title: rows})
+            return result['success']
         except Exception as e:
-            print(f"Error saving missions to CSV: {e}")
+            print(f"Error saving {table} rows to sheets: {e}")
             return False
     
-    # ============ GOOGLE SHEETS SAVE METHODS ============
-    
     def _save_pilots_to_sheets(self):
         """Save pilots to Google Sheets"""
         try:
             df_to_save = self.pilots_df.copy()
             df_to_save['available_from'] = df_to_save['available_from'].dt.strftime('%Y-%m-%d')
             result = self.sheets_sync.sync_pilots_to_sheet(df_to_save)
+            if result['success']:
+                self._sheet_columns['pilots'] = list(df_to_save.columns)
             return result['success']
         except Exception as e:
             print(f"Error saving pilots to sheets: {e}")
@@ -227,6 +198,8 @@ class CloudDataLoader:
             df_to_save = self.drones_df.copy()
             df_to_save['maintenance_due'] = df_to_save['maintenance_due'].dt.strftime('%Y-%m-%d')
             result = self.sheets_sync.sync_drones_to_sheet(df_to_save)
+            if result['success']:
+                self._sheet_columns['drones'] = list(df_to_save.columns)
             return result['success']
         except Exception as e:
             print(f"Error saving drones to sheets: {e}")
@@ -239,6 +212,8 @@ class CloudDataLoader:
             df_to_save['start_date'] = df_to_save['start_date'].dt.strftime('%Y-%m-%d')
             df_to_save['end_date'] = df_to_save['end_date'].dt.strftime('%Y-%m-%d')
             result = self.sheets_sync.sync_missions_to_sheet(df_to_save)
+            if result['success']:
+                self._sheet_columns['missions'] = list(df_to_save.columns)
             return result['success']
         except Exception as e:
             print(f"Error saving missions to sheets: {e}")
@@ -1,264 +1,284 @@
+from collections import Counter
 from datetime import datetime
+import numpy as np
+
+from modules.data_loader import UNASSIGNED, split_items, item_set, membership_matrix, match_counts
+
+# Sort rank of each severity, unknown severities go last
+SEVERITY_ORDER = {'CRITICAL': 0, 'HIGH': 1, 'MEDIUM': 2, 'LOW': 3}
+
+# Pilot status -> (conflict type, severity) when the pilot still holds an assignment
+BOOKING_CONFLICTS = {
+    'On Leave': ('Pilot On Leave but Assigned', 'CRITICAL'),
+    'Unavailable': ('Pilot Unavailable but Assigned', 'HIGH'),
+}
 
 class ConflictDetector:
     """Detect and flag conflicts in assignments"""
     
     def __init__(self, data_loader):
         self.data_loader = data_loader
+        self._cache = (None, [])  # (data_loader.data_version, last get_all_conflicts result), replaced as a whole
+    
+    def _snapshot(self):
+        """Fetch the frames once for a whole conflict scan (read-only views), with assignments joined to missions"""
+        pilots = self.data_loader.get_pilots_view()
+        drones = self.data_loader.get_drones_view()
+        missions = self.data_loader.get_missions_view()
+        
+        # First row per project_id wins, like a per-row mission lookup
+        first_missions = missions.drop_duplicates('project_id')
+        return {
+            'pilots': pilots,
+            'drones': drones,
+            'missions': missions,
+            'pilot_missions': self._join_missions(pilots, first_missions),
+            'drone_missions': self._join_missions(drones, first_missions),
+        }
+    
+    def _join_missions(self, assets, missions):
+        """Join assigned pilots or drones to their mission, mission columns that clash get a _mis suffix"""
+        assigned = assets[assets['current_assignment'] != UNASSIGNED]
+        return assigned.merge(missions, left_on='current_assignment', right_on='project_id', suffixes=('', '_mis'))
     
     def check_date_overlap(self, date1_start, date1_end, date2_start, date2_end):
         """Check if two date ranges overlap"""
         return not (date1_end < date2_start or date2_end < date1_start)
     
-    def detect_pilot_double_booking(self):
+    def detect_pilot_double_booking(self, snapshot=None):
         """Detect pilots on leave but assigned, or other booking conflicts"""
         conflicts = []
-        pilots = self.data_loader.get_pilots()
-        missions = self.data_loader.get_missions()
-        
-        for idx, pilot in pilots.iterrows():
-            # Check if pilot is On Leave but has an assignment
-            if pilot['status'] == 'On Leave' and pilot['current_assignment'] != '–':
-                conflicts.append({
-                    'type': 'Pilot On Leave but Assigned',
-                    'severity': 'CRITICAL',
-                    'pilot_id': pilot['pilot_id'],
-                    'pilot_name': pilot['name'],
-                    'pilot_status': pilot['status'],
-                    'assignment': pilot['current_assignment'],
-                    'issue': f"{pilot['name']} is On Leave but assigned to {pilot['current_assignment']}"
-                })
-            
-            # Check if pilot is Unavailable but has an assignment
-            if pilot['status'] == 'Unavailable' and pilot['current_assignment'] != '–':
-                conflicts.append({
-                    'type': 'Pilot Unavailable but Assigned',
-                    'severity': 'HIGH',
-                    'pilot_id': pilot['pilot_id'],
-                    'pilot_name': pilot['name'],
-                    'pilot_status': pilot['status'],
-                    'assignment': pilot['current_assignment'],
-                    'issue': f"{pilot['name']} is Unavailable but assigned to {pilot['current_assignment']}"
-                })
+        pilots = (snapshot or self._snapshot())['pilots']
+        
+        # Only pilots on leave or unavailable while holding an assignment can conflict
+        mask = pilots['status'].isin(BOOKING_CONFLICTS) & (pilots['current_assignment'] != UNASSIGNED)
+        
+        for pilot in pilots.loc[mask, ['pilot_id', 'name', 'status', 'current_assignment']].itertuples(index=False):
+            conflict_type, severity = BOOKING_CONFLICTS[pilot.status]
+            conflicts.append({
+                'type': conflict_type,
+                'severity': severity,
+                'pilot_id': pilot.pilot_id,
+                'pilot_name': pilot.name,
+                'pilot_status': pilot.status,
+                'assignment': pilot.current_assignment,
+                'issue': f"{pilot.name} is {pilot.status} but assigned to {pilot.current_assignment}"
+            })
         
         return conflicts
     
-    def detect_skill_mismatch(self):
+    def _find_missing(self, pilot_missions, have_column, required_column):
+        """Keep the joined pilot/mission rows lacking some required item, listed in a missing column"""
+        missing = []
+        for needed, have in zip(pilot_missions[required_column], pilot_missions[have_column]):
+            have_set = item_set(have)
+            missing.append([item for item in split_items(needed) if item not in have_set])
+        # assign() returns a new frame, the shared join stays untouched
+        joined = pilot_missions.assign(missing=missing)
+        return joined[joined['missing'].map(len) > 0]
+    
+    def detect_skill_mismatch(self, snapshot=None):
         """Detect pilots assigned to projects requiring skills they lack"""
         conflicts = []
-        pilots = self.data_loader.get_pilots()
-        missions = self.data_loader.get_missions()
+        pilot_missions = (snapshot or self._snapshot())['pilot_missions']
         
-        for idx, pilot in pilots.iterrows():
-            if pilot['current_assignment'] == '–':
-                continue
-            
-            mission = missions[missions['project_id'] == pilot['current_assignment']]
-            if mission.empty:
-                continue
-            
-            mission = mission.iloc[0]
-            
-            pilot_skills = [s.strip() for s in str(pilot['skills']).split(',')]
-            required_skills = [s.strip() for s in str(mission['required_skills']).split(',')]
-            
-            missing_skills = [s for s in required_skills if s not in pilot_skills]
-            
-            if missing_skills:
-                conflicts.append({
-                    'type': 'Skill Mismatch',
-                    'severity': 'MEDIUM',
-                    'pilot_id': pilot['pilot_id'],
-                    'pilot_name': pilot['name'],
-                    'assignment': mission['project_id'],
-                    'missing_skills': missing_skills,
-                    'issue': f"{pilot['name']} lacks skills: {', '.join(missing_skills)}"
-                })
+        for row in self._find_missing(pilot_missions, 'skills', 'required_skills').itertuples(index=False):
+            conflicts.append({
+                'type': 'Skill Mismatch',
+                'severity': 'MEDIUM',
+                'pilot_id': row.pilot_id,
+                'pilot_name': row.name,
+                'assignment': row.project_id,
+                'missing_skills': row.missing,
+                'issue': f"{row.name} lacks skills: {', '.join(row.missing)}"
+            })
         
         return conflicts
     
-    def detect_certification_mismatch(self):
+    def detect_certification_mismatch(self, snapshot=None):
         """Detect pilots lacking required certifications"""
         conflicts = []
-        pilots = self.data_loader.get_pilots()
-        missions = self.data_loader.get_missions()
+        pilot_missions = (snapshot or self._snapshot())['pilot_missions']
         
-        for idx, pilot in pilots.iterrows():
-            if pilot['current_assignment'] == '–':
-                continue
-            
-            mission = missions[missions['project_id'] == pilot['current_assignment']]
-            if mission.empty:
-                continue
-            
-            mission = mission.iloc[0]
-            
-            pilot_certs = [c.strip() for c in str(pilot['certifications']).split(',')]
-            required_certs = [c.strip() for c in str(mission['required_certs']).split(',')]
-            
-            missing_certs = [c for c in required_certs if c not in pilot_certs]
-            
-            if missing_certs:
-                conflicts.append({
-                    'type': 'Certification Mismatch',
-                    'severity': 'HIGH',
-                    'pilot_id': pilot['pilot_id'],
-                    'pilot_name': pilot['name'],
-                    'assignment': mission['project_id'],
-                    'missing_certs': missing_certs,
-                    'issue': f"{pilot['name']} lacks certifications: {', '.join(missing_certs)}"
-                })
+        for row in self._find_missing(pilot_missions, 'certifications', 'required_certs').itertuples(index=False):
+            conflicts.append({
+                'type': 'Certification Mismatch',
+                'severity': 'HIGH',
+                'pilot_id': row.pilot_id,
+                'pilot_name': row.name,
+                'assignment': row.project_id,
+                'missing_certs': row.missing,
+                'issue': f"{row.name} lacks certifications: {', '.join(row.missing)}"
+            })
         
         return conflicts
     
-    def detect_location_mismatch(self):
+    def _location_mismatches(self, joined):
+        """Keep the joined rows whose location differs from the mission's"""
+        return joined[joined['location'].values != joined['location_mis'].values]
+    
+    def detect_location_mismatch(self, snapshot=None):
         """Detect pilot-drone location mismatches for same project"""
         conflicts = []
-        pilots = self.data_loader.get_pilots()
-        drones = self.data_loader.get_drones()
-        missions = self.data_loader.get_missions()
+        snapshot = snapshot or self._snapshot()
         
         # Check pilot location vs mission location
-        for idx, pilot in pilots.iterrows():
-            if pilot['current_assignment'] == '–':
-                continue
-            
-            mission = missions[missions['project_id'] == pilot['current_assignment']]
-            if mission.empty:
-                continue
-            
-            mission = mission.iloc[0]
-            
-            if pilot['location'] != mission['location']:
-                conflicts.append({
-                    'type': 'Pilot Location Mismatch',
-                    'severity': 'MEDIUM',
-                    'pilot_id': pilot['pilot_id'],
-                    'pilot_name': pilot['name'],
-                    'pilot_location': pilot['location'],
-                    'mission_location': mission['location'],
-                    'issue': f"{pilot['name']} is in {pilot['location']} but assigned to mission in {mission['location']}"
-                })
+        for pilot in self._location_mismatches(snapshot['pilot_missions']).itertuples(index=False):
+            conflicts.append({
+                'type': 'Pilot Location Mismatch',
+                'severity': 'MEDIUM',
+                'pilot_id': pilot.pilot_id,
+                'pilot_name': pilot.name,
+                'pilot_location': pilot.location,
+                'mission_location': pilot.location_mis,
+                'issue': f"{pilot.name} is in {pilot.location} but assigned to mission in {pilot.location_mis}"
+            })
         
         # Check drone location vs mission location
-        for idx, drone in drones.iterrows():
-            if drone['current_assignment'] == '–':
-                continue
-            
-            mission = missions[missions['project_id'] == drone['current_assignment']]
-            if mission.empty:
-                continue
-            
-            mission = mission.iloc[0]
-            
-            if drone['location'] != mission['location']:
-                conflicts.append({
-                    'type': 'Drone Location Mismatch',
-                    'severity': 'MEDIUM',
-                    'drone_id': drone['drone_id'],
-                    'drone_model': drone['model'],
-                    'drone_location': drone['location'],
-                    'mission_location': mission['location'],
-                    'issue': f"{drone['model']} is in {drone['location']} but assigned to mission in {mission['location']}"
-                })
+        for drone in self._location_mismatches(snapshot['drone_missions']).itertuples(index=False):
+            conflicts.append({
+                'type': 'Drone Location Mismatch',
+                'severity': 'MEDIUM',
+                'drone_id': drone.drone_id,
+                'drone_model': drone.model,
+                'drone_location': drone.location,
+                'mission_location': drone.location_mis,
+                'issue': f"{drone.model} is in {drone.location} but assigned to mission in {drone.location_mis}"
+            })
         
         return conflicts
     
-    def detect_maintenance_conflict(self):
+    def detect_maintenance_conflict(self, snapshot=None):
         """Detect drones in maintenance assigned to projects"""
         conflicts = []
-        drones = self.data_loader.get_drones()
-        
-        for idx, drone in drones.iterrows():
-            if drone['status'] == 'Maintenance' and drone['current_assignment'] != '–':
-                conflicts.append({
-                    'type': 'Maintenance Conflict',
-                    'severity': 'CRITICAL',
-                    'drone_id': drone['drone_id'],
-                    'drone_model': drone['model'],
-                    'status': drone['status'],
-                    'assignment': drone['current_assignment'],
-                    'issue': f"{drone['model']} is in Maintenance but assigned to {drone['current_assignment']}"
-                })
+        drones = (snapshot or self._snapshot())['drones']
+        
+        mask = (drones['status'].values == 'Maintenance') & (drones['current_assignment'].values != UNASSIGNED)
+        
+        for drone in drones.loc[mask, ['drone_id', 'model', 'status', 'current_assignment']].itertuples(index=False):
+            conflicts.append({
+                'type': 'Maintenance Conflict',
+                'severity': 'CRITICAL',
+                'drone_id': drone.drone_id,
+                'drone_model': drone.model,
+                'status': drone.status,
+                'assignment': drone.current_assignment,
+                'issue': f"{drone.model} is in Maintenance but assigned to {drone.current_assignment}"
+            })
         
         return conflicts
     
     def get_all_conflicts(self):
         """Get all detected conflicts"""
-        all_conflicts = []
-        all_conflicts.extend(self.detect_pilot_double_booking())
-        all_conflicts.extend(self.detect_skill_mismatch())
-        all_conflicts.extend(self.detect_certification_mismatch())
-        all_conflicts.extend(self.detect_location_mismatch())
-        all_conflicts.extend(self.detect_maintenance_conflict())
-        all_conflicts.extend(self.detect_urgent_mission_conflicts())
-        
-        # Remove duplicates based on issue
+        # The loader bumps data_version on every load and edit, so an unchanged version means unchanged conflicts
+        version, conflicts = self._cache
+        if version == self.data_loader.data_version:
+            return list(conflicts)
+        
+        # The loader is shared across sessions: scan under its lock so no edit lands mid-scan
+        with self.data_loader.lock:
+            version = self.data_loader.data_version
+            
+            # Fetch the frames and build the mission joins once, every detector reads the same ones
+            snapshot = self._snapshot()
+            
+            all_conflicts = []
+            all_conflicts.extend(self.detect_pilot_double_booking(snapshot))
+            all_conflicts.extend(self.detect_skill_mismatch(snapshot))
+            all_conflicts.extend(self.detect_certification_mismatch(snapshot))
+            all_conflicts.extend(self.detect_location_mismatch(snapshot))
+            all_conflicts.extend(self.detect_maintenance_conflict(snapshot))
+            all_conflicts.extend(self.detect_urgent_mission_conflicts(snapshot))
+        
+        # Remove duplicates based on issue, bucketing by severity in the same pass
         seen_issues = set()
-        unique_conflicts = []
+        buckets = [[] for _ in range(len(SEVERITY_ORDER) + 1)]
         for conflict in all_conflicts:
             if conflict['issue'] not in seen_issues:
                 seen_issues.add(conflict['issue'])
-                unique_conflicts.append(conflict)
-        
-        # Sort by severity
-        severity_order = {'CRITICAL': 0, 'HIGH': 1, 'MEDIUM': 2, 'LOW': 3}
-        unique_conflicts.sort(key=lambda x: severity_order.get(x['severity'], 4))
+                buckets[SEVERITY_ORDER.get(conflict['severity'], len(SEVERITY_ORDER))].append(conflict)
         
-        return unique_conflicts
+        # Concatenating the buckets is a stable sort by severity
+        conflicts = [conflict for bucket in buckets for conflict in bucket]
+        self._cache = (version, conflicts)
+        return list(conflicts)
     
-    def detect_urgent_mission_conflicts(self):
+    def detect_urgent_mission_conflicts(self, snapshot=None):
         """Detect urgent/high priority missions with issues"""
         conflicts = []
-        missions = self.data_loader.get_missions()
-        pilots = self.data_loader.get_pilots()
+        snapshot = snapshot or self._snapshot()
+        pilots, missions = snapshot['pilots'], snapshot['missions']
+        
+        # Positions of the pilots on each mission, in roster order, so missions don't filter the roster
+        pilots_by_mission = {}
+        for position, assignment in enumerate(pilots['current_assignment'].to_numpy()):
+            pilots_by_mission.setdefault(assignment, []).append(position)
+        pilot_ids = pilots['pilot_id'].to_numpy()
+        pilot_names = pilots['name'].to_numpy()
+        pilot_statuses = pilots['status'].to_numpy()
         
-        for idx, mission in missions.iterrows():
-            if mission['priority'] in ['Urgent', 'High']:
+        def column(name, default):
+            return missions[name].to_numpy() if name in missions.columns else [default] * len(missions)
+        
+        mission_rows = zip(
+            missions['project_id'].to_numpy(), missions['priority'].to_numpy(),
+            column('client', 'Unknown'), column('location', 'Unknown'), column('required_skills', '')
+        )
+        for project_id, priority, client, location, required_skills in mission_rows:
+            if priority in ['Urgent', 'High']:
                 # Check if any pilot assigned to this mission is on leave
-                assigned_pilots = pilots[pilots['current_assignment'] == mission['project_id']]
+                assigned_pilots = pilots_by_mission.get(project_id, [])
                 
                 # Check if no pilot is assigned to urgent/high priority mission
-                if assigned_pilots.empty:
+                if not assigned_pilots:
                     conflicts.append({
                         'type': 'Unassigned Urgent Mission',
-                        'severity': 'CRITICAL' if mission['priority'] == 'Urgent' else 'HIGH',
-                        'assignment': mission['project_id'],
-                        'client': mission.get('client', 'Unknown'),
-                        'priority': mission['priority'],
-                        'location': mission.get('location', 'Unknown'),
-                        'required_skills': mission.get('required_skills', ''),
-                        'issue': f"ATTENTION: {mission['priority']} priority mission {mission['project_id']} ({mission.get('client', 'Unknown')}) has NO pilot assigned!"
+                        'severity': 'CRITICAL' if priority == 'Urgent' else 'HIGH',
+                        'assignment': project_id,
+                        'client': client,
+                        'priority': priority,
+                        'location': location,
+                        'required_skills': required_skills,
+                        'issue': f"ATTENTION: {priority} priority mission {project_id} ({client}) has NO pilot assigned!"
                     })
                 else:
-                    for _, pilot in assigned_pilots.iterrows():
-                        if pilot['status'] == 'On Leave':
+                    for i in assigned_pilots:
+                        if pilot_statuses[i] == 'On Leave':
                             conflicts.append({
                                 'type': 'Urgent Mission - Pilot On Leave',
                                 'severity': 'CRITICAL',
-                                'pilot_id': pilot['pilot_id'],
-                                'pilot_name': pilot['name'],
-                                'pilot_status': pilot['status'],
-                                'assignment': mission['project_id'],
-                                'priority': mission['priority'],
-                                'issue': f"URGENT: {pilot['name']} is On Leave but assigned to {mission['priority']} priority mission {mission['project_id']}"
+                                'pilot_id': pilot_ids[i],
+                                'pilot_name': pilot_names[i],
+                                'pilot_status': pilot_statuses[i],
+                                'assignment': project_id,
+                                'priority': priority,
+                                'issue': f"URGENT: {pilot_names[i]} is On Leave but assigned to {priority} priority mission {project_id}"
                             })
         
         return conflicts
     
     def get_conflicts_summary(self):
         """Get summary of conflicts"""
+        return self.analyze()['summary']
+    
+    def analyze(self):
+        """Run all detectors once and return every view the UI needs"""
         conflicts = self.get_all_conflicts()
+        counts = Counter(c['severity'] for c in conflicts)
         
         summary = {
             'total_conflicts': len(conflicts),
-            'critical': len([c for c in conflicts if c['severity'] == 'CRITICAL']),
-            'high': len([c for c in conflicts if c['severity'] == 'HIGH']),
-            'medium': len([c for c in conflicts if c['severity'] == 'MEDIUM']),
+            'critical': counts['CRITICAL'],
+            'high': counts['HIGH'],
+            'medium': counts['MEDIUM'],
             'conflicts': conflicts
         }
         
-        return summary
+        return {
+            'all': conflicts,
+            'summary': summary,
+            'critical': [c for c in conflicts if c['severity'] in ['CRITICAL', 'HIGH']]
+        }
     
     def find_best_replacement_pilot(self, mission_id):
         """Find the best available pilot for a mission"""
@@ -266,7 +286,7 @@ class ConflictDetector:
         if mission is None:
             return None
         
-        pilots = self.data_loader.get_pilots()
+        pilots = self.data_loader.get_pilots_view()
         available_pilots = pilots[pilots['status'] == 'Available']
         
         # Filter by location
@@ -275,31 +295,22 @@ class ConflictDetector:
         if location_match.empty:
             return None
         
-        required_skills = [s.strip().lower() for s in str(mission['required_skills']).split(',')]
-        required_certs = [c.strip().lower() for c in str(mission['required_certs']).split(',')]
+        required_skills = split_items(str(mission['required_skills']).lower())
+        required_certs = split_items(str(mission['required_certs']).lower())
         
-        best_pilot = None
-        best_score = -1
+        pilot_skills = membership_matrix([item_set(str(skills).lower()) for skills in location_match['skills'].to_numpy()])
+        pilot_certs = membership_matrix([item_set(str(certs).lower()) for certs in location_match['certifications'].to_numpy()])
         
-        for idx, pilot in location_match.iterrows():
-            pilot_skills = [s.strip().lower() for s in str(pilot['skills']).split(',')]
-            pilot_certs = [c.strip().lower() for c in str(pilot['certifications']).split(',')]
-            
-            # Calculate match score
-            skill_matches = sum(1 for s in required_skills if s in pilot_skills)
-            cert_matches = sum(1 for c in required_certs if c in pilot_certs)
-            
-            # Require at least base DGCA certification
-            if 'dgca' not in pilot_certs:
-                continue
-            
-            score = skill_matches * 2 + cert_matches  # Skills weighted higher
-            
-            if score > best_score:
-                best_score = score
-                best_pilot = pilot
+        # Score all candidates at once from the membership matrices, skills weighted higher
+        candidates = np.arange(len(location_match))
+        scores = match_counts(*pilot_skills, required_skills, candidates) * 2 + match_counts(*pilot_certs, required_certs, candidates)
+        
+        # Require at least base DGCA certification
+        scores[match_counts(*pilot_certs, ('dgca',), candidates) == 0] = -1
         
-        return best_pilot
+        # argmax returns the first best candidate, like a strict > scan
+        best_position = int(np.argmax(scores))
+        return location_match.iloc[best_position] if scores[best_position] >= 0 else None
     
     def auto_reassign_urgent_conflicts(self, roster_manager):
         """Automatically reassign for CRITICAL and HIGH severity conflicts"""
@@ -352,7 +363,7 @@ class ConflictDetector:
                     new_pilot_id = replacement['pilot_id']
                     
                     # Clear old pilot assignment
-                    self.data_loader.update_pilot_status(old_pilot_id, conflict.get('pilot_status', 'On Leave'), '–')
+                    self.data_loader.update_pilot_status(old_pilot_id, conflict.get('pilot_status', 'On Leave'), UNASSIGNED)
                     
                     # Assign new pilot
                     self.data_loader.update_pilot_status(new_pilot_id, 'Assigned', mission_id)
@@ -1,35 +1,132 @@
+import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 import os
+import threading
+
+# Low-cardinality columns kept as categoricals, so mask comparisons run on integer codes
+CATEGORY_COLUMNS = {
+    'pilots': ['status', 'location', 'current_assignment'],
+    'drones': ['status', 'location', 'current_assignment'],
+    'missions': ['priority'],
+}
+
+# read_csv options for the CSV seed files: dates and categoricals are parsed while reading
+CSV_READ_OPTIONS = {
+    'pilot_roster': {'dtype': dict.fromkeys(CATEGORY_COLUMNS['pilots'], 'category'), 'parse_dates': ['available_from']},
+    'drone_fleet': {'dtype': dict.fromkeys(CATEGORY_COLUMNS['drones'], 'category'), 'parse_dates': ['maintenance_due']},
+    'missions': {'dtype': dict.fromkeys(CATEGORY_COLUMNS['missions'], 'category'), 'parse_dates': ['start_date', 'end_date']},
+}
+
+# Parquet/CSV file name of each table
+FILE_NAMES = {'pilots': 'pilot_roster', 'drones': 'drone_fleet', 'missions': 'missions'}
+
+# Id column of each table
+ID_COLUMNS = {'pilots': 'pilot_id', 'drones': 'drone_id', 'missions': 'project_id'}
+
+# current_assignment value of pilots and drones without a mission
+UNASSIGNED = '–'
+
+@lru_cache(maxsize=4096)
+def split_items(value):
+    """Parse a comma-separated cell (skills, certifications, capabilities) into a tuple of stripped items, memoized per value"""
+    return tuple(item.strip() for item in str(value).split(','))
+
+@lru_cache(maxsize=4096)
+def item_set(value):
+    """Same as split_items but as a frozenset for membership tests"""
+    return frozenset(split_items(value))
+
+def membership_matrix(sets):
+    """Encode per-row item sets as ({item: column}, rows x items bool matrix)"""
+    columns = {item: i for i, item in enumerate(sorted(set().union(*sets)))}
+    matrix = np.zeros((len(sets), len(columns)), dtype=bool)
+    for row, items in enumerate(sets):
+        matrix[row, [columns[item] for item in items]] = True
+    return columns, matrix
+
+def match_counts(columns, matrix, required, rows):
+    """How many of the required items (repeats counted) each of the given rows has"""
+    wanted = [columns[item] for item in required if item in columns]
+    return matrix[np.ix_(rows, wanted)].sum(axis=1, dtype=int)
 
 class DataLoader:
-    """Load and manage data from CSV files"""
+    """Load and manage data from local files (Parquet, seeded from CSV)"""
     
     def __init__(self, data_dir="."):
         self.data_dir = data_dir
         self.pilots_df = None
         self.drones_df = None
         self.missions_df = None
+        self.data_version = 0  # Bumped whenever the in-memory data changes
+        self._dirty = {'pilots': set(), 'drones': set(), 'missions': set()}  # Ids edited since the last flush
+        self._row_index = {}  # table -> {id: row position}, rebuilt on every load
+        self._col_index = {}  # table -> {column: position}, for .iat writes
+        # One loader is shared by every session and the background flush: loads, edits and saves take this lock
+        self.lock = threading.RLock()
+        self._flush_timer = None  # Pending schedule_flush() timer, one for all sessions
+        self.flush_failures = 0  # Scheduled flushes that failed, sessions compare it to the count they last saw
         self.load_all_data()
     
     def load_all_data(self):
-        """Load all CSV files"""
+        """Load all tables (Parquet, or the CSV seed files on first run)"""
+        with self.lock:
+            self._load_tables()
+            self._build_indexes()
+            self._dirty = {'pilots': set(), 'drones': set(), 'missions': set()}
+            self.data_version += 1
+    
+    def _load_tables(self):
+        """Fill pilots_df, drones_df and missions_df (CloudDataLoader reads Google Sheets here)"""
+        self._load_from_files()
+    
+    def _load_from_files(self):
+        """Load data from Parquet files (or the CSV seed files on first run)"""
         try:
-            self.pilots_df = pd.read_csv(os.path.join(self.data_dir, "pilot_roster.csv"))
-            self.drones_df = pd.read_csv(os.path.join(self.data_dir, "drone_fleet.csv"))
-            self.missions_df = pd.read_csv(os.path.join(self.data_dir, "missions.csv"))
+            self.pilots_df = self._read("pilot_roster")
+            self.drones_df = self._read("drone_fleet")
+            self.missions_df = self._read("missions")
             
-            # Parse date columns
-            self.pilots_df['available_from'] = pd.to_datetime(self.pilots_df['available_from'])
-            self.drones_df['maintenance_due'] = pd.to_datetime(self.drones_df['maintenance_due'])
-            self.missions_df['start_date'] = pd.to_datetime(self.missions_df['start_date'])
-            self.missions_df['end_date'] = pd.to_datetime(self.missions_df['end_date'])
+            # Dates are parsed while reading, older Parquet files may still lack categoricals
+            self._to_categories()
+            self._migrate_to_parquet()
             
         except FileNotFoundError as e:
             raise Exception(f"Data file not found: {e}")
         except Exception as e:
             raise Exception(f"Error loading data: {e}")
     
+    def _to_categories(self):
+        """Store low-cardinality columns as categoricals"""
+        for table, columns in CATEGORY_COLUMNS.items():
+            df = getattr(self, f"{table}_df")
+            df[columns] = df[columns].astype('category')
+    
+    def _read(self, name):
+        """Read a table from Parquet, falling back to the CSV of the same name"""
+        parquet_path = os.path.join(self.data_dir, f"{name}.parquet")
+        if os.path.exists(parquet_path):
+            return pd.read_parquet(parquet_path)
+        return pd.read_csv(os.path.join(self.data_dir, f"{name}.csv"), engine='c', **CSV_READ_OPTIONS[name])
+    
+    def _write(self, name, df):
+        """Write a table to Parquet (keeps dtypes, so no date formatting is needed)"""
+        path = os.path.join(self.data_dir, f"{name}.parquet")
+        # Write next to the target and swap it in, so a failed write never leaves a truncated file
+        df.to_parquet(f"{path}.tmp", compression="zstd", index=False)
+        os.replace(f"{path}.tmp", path)
+    
+    def _migrate_to_parquet(self):
+        """Write Parquet copies of tables that so far only exist as CSV"""
+        for table, name in FILE_NAMES.items():
+            if not os.path.exists(os.path.join(self.data_dir, f"{name}.parquet")):
+                try:
+                    self._write(name, getattr(self, f"{table}_df"))
+                except Exception as e:
+                    print(f"Warning: Could not write {name}.parquet: {e}")
+    
     def get_pilots(self):
         """Return pilots dataframe"""
         return self.pilots_df.copy()
@@ -42,92 +139,197 @@ class DataLoader:
         """Return missions dataframe"""
         return self.missions_df.copy()
     
+    # The *_view methods return the loader's own frames without copying.
+    # They are read-only: use get_pilots() etc. for frames you want to modify.
+    def get_pilots_view(self):
+        """Return the pilots dataframe itself (read-only)"""
+        return self.pilots_df
+    
+    def get_drones_view(self):
+        """Return the drones dataframe itself (read-only)"""
+        return self.drones_df
+    
+    def get_missions_view(self):
+        """Return the missions dataframe itself (read-only)"""
+        return self.missions_df
+    
+    def _build_indexes(self):
+        """Map each id to the position of its first row, and each column to its position"""
+        self._row_index = {}
+        self._col_index = {}
+        for table, id_col in ID_COLUMNS.items():
+            df = getattr(self, f"{table}_df")
+            ids = df[id_col].tolist()
+            # Reversed so the first row wins for duplicated ids, like a boolean-mask lookup
+            self._row_index[table] = dict(zip(reversed(ids), range(len(ids) - 1, -1, -1)))
+            self._col_index[table] = {column: i for i, column in enumerate(df.columns)}
+    
+    def lookup(self, table, id_val, column, default=None):
+        """Read one cell by id without building the whole row, or default if the id is unknown"""
+        position = self._row_index[table].get(id_val)
+        if position is None:
+            return default
+        return getattr(self, f"{table}_df").iat[position, self._col_index[table][column]]
+    
     def get_pilot_by_id(self, pilot_id):
         """Get specific pilot by ID"""
-        result = self.pilots_df[self.pilots_df['pilot_id'] == pilot_id]
-        return result.iloc[0] if not result.empty else None
+        position = self._row_index['pilots'].get(pilot_id)
+        return self.pilots_df.iloc[position] if position is not None else None
     
     def get_drone_by_id(self, drone_id):
         """Get specific drone by ID"""
-        result = self.drones_df[self.drones_df['drone_id'] == drone_id]
-        return result.iloc[0] if not result.empty else None
+        position = self._row_index['drones'].get(drone_id)
+        return self.drones_df.iloc[position] if position is not None else None
     
     def get_mission_by_id(self, project_id):
         """Get specific mission by ID"""
-        result = self.missions_df[self.missions_df['project_id'] == project_id]
-        return result.iloc[0] if not result.empty else None
+        position = self._row_index['missions'].get(project_id)
+        return self.missions_df.iloc[position] if position is not None else None
+    
+    def update_row(self, table, id_col, id_val, updates):
+        """Update one row of a table ('pilots', 'drones', 'missions') and mark it for the next flush"""
+        with self.lock:
+            df = getattr(self, f"{table}_df")
+            if id_col == ID_COLUMNS[table]:
+                position = self._row_index[table].get(id_val)
+            else:
+                match = (df[id_col] == id_val).to_numpy().nonzero()[0]
+                position = match[0] if len(match) > 0 else None
+            if position is None:
+                return False
+            columns = self._col_index[table]
+            for column, value in updates.items():
+                if column in columns:
+                    series = df[column]
+                    if isinstance(series.dtype, pd.CategoricalDtype) and value not in series.cat.categories and not pd.isna(value):
+                        df[column] = series.cat.add_categories([value])
+                    df.iat[position, columns[column]] = value
+                else:
+                    # New column (e.g. assigned_pilot on missions), set by label and indexed
+                    df.loc[df.index[position], column] = value
+                    columns[column] = df.columns.get_loc(column)
+            self._dirty[table].add(id_val)
+            self.data_version += 1
+            return True
     
     def update_pilot_status(self, pilot_id, new_status, current_assignment=None, available_from=None):
         """Update pilot status in dataframe"""
-        idx = self.pilots_df[self.pilots_df['pilot_id'] == pilot_id].index
-        if len(idx) > 0:
-            self.pilots_df.loc[idx[0], 'status'] = new_status
-            if current_assignment:
-                self.pilots_df.loc[idx[0], 'current_assignment'] = current_assignment
-            if available_from:
-                self.pilots_df.loc[idx[0], 'available_from'] = available_from
-            return True
-        return False
+        updates = {'status': new_status}
+        if current_assignment:
+            updates['current_assignment'] = current_assignment
+        if available_from:
+            updates['available_from'] = pd.Timestamp(available_from)
+        return self.update_row('pilots', 'pilot_id', pilot_id, updates)
     
     def update_drone_status(self, drone_id, new_status, current_assignment=None):
         """Update drone status in dataframe"""
-        idx = self.drones_df[self.drones_df['drone_id'] == drone_id].index
-        if len(idx) > 0:
-            self.drones_df.loc[idx[0], 'status'] = new_status
-            if current_assignment:
-                self.drones_df.loc[idx[0], 'current_assignment'] = current_assignment
-            return True
-        return False
+        updates = {'status': new_status}
+        if current_assignment:
+            updates['current_assignment'] = current_assignment
+        return self.update_row('drones', 'drone_id', drone_id, updates)
     
-    # ============ SAVE METHODS - Persist to CSV ============
+    def update_pilot(self, pilot_id, fields):
+        """Update several pilot fields ({column: value}) in one call"""
+        return self.update_row('pilots', 'pilot_id', pilot_id, fields)
     
-    def save_pilots(self):
-        """Save pilots dataframe back to CSV"""
+    def update_drone(self, drone_id, fields):
+        """Update several drone fields ({column: value}) in one call"""
+        return self.update_row('drones', 'drone_id', drone_id, fields)
+    
+    # ============ SAVE METHODS - Persist to Parquet ============
+    
+    def _save_file(self, table):
+        """Write one table to Parquet, reporting (not raising) errors"""
         try:
-            # Create a copy for saving
-            df_to_save = self.pilots_df.copy()
-            # Convert datetime back to string format
-            df_to_save['available_from'] = df_to_save['available_from'].dt.strftime('%Y-%m-%d')
-            df_to_save.to_csv(os.path.join(self.data_dir, "pilot_roster.csv"), index=False)
+            self._write(FILE_NAMES[table], getattr(self, f"{table}_df"))
             return True
         except Exception as e:
-            print(f"Error saving pilots: {e}")
+            print(f"Error saving {table}: {e}")
             return False
     
+    def save_pilots(self):
+        """Save pilots dataframe to Parquet"""
+        with self.lock:
+            return self._save_file('pilots')
+    
     def save_drones(self):
-        """Save drones dataframe back to CSV"""
-        try:
-            df_to_save = self.drones_df.copy()
-            df_to_save['maintenance_due'] = df_to_save['maintenance_due'].dt.strftime('%Y-%m-%d')
-            df_to_save.to_csv(os.path.join(self.data_dir, "drone_fleet.csv"), index=False)
-            return True
-        except Exception as e:
-            print(f"Error saving drones: {e}")
-            return False
+        """Save drones dataframe to Parquet"""
+        with self.lock:
+            return self._save_file('drones')
     
     def save_missions(self):
-        """Save missions dataframe back to CSV"""
-        try:
-            df_to_save = self.missions_df.copy()
-            df_to_save['start_date'] = df_to_save['start_date'].dt.strftime('%Y-%m-%d')
-            df_to_save['end_date'] = df_to_save['end_date'].dt.strftime('%Y-%m-%d')
-            df_to_save.to_csv(os.path.join(self.data_dir, "missions.csv"), index=False)
-            return True
-        except Exception as e:
-            print(f"Error saving missions: {e}")
-            return False
+        """Save missions dataframe to Parquet"""
+        with self.lock:
+            return self._save_file('missions')
     
     def save_all(self):
-        """Save all dataframes to CSV"""
-        return self.save_pilots() and self.save_drones() and self.save_missions()
+        """Save all dataframes to Parquet"""
+        # The three files are independent, and pyarrow releases the GIL while writing.
+        # The workers write while this thread holds the lock, so no edit lands mid-save
+        with self.lock, ThreadPoolExecutor(max_workers=3) as executor:
+            return all(list(executor.map(self._save_file, FILE_NAMES)))
+    
+    def flush_pending(self):
+        """Save every table that has rows edited since the last flush"""
+        with self.lock:
+            success = True
+            for table, ids in self._dirty.items():
+                if not ids:
+                    continue
+                self._dirty[table] = set()
+                if not getattr(self, f"save_{table}")():
+                    # Keep the rows dirty so the next flush retries them
+                    self._dirty[table] |= ids
+                    success = False
+            return success
+    
+    def schedule_flush(self, delay):
+        """Flush in the background after delay seconds, edits made until then share that one flush"""
+        with self.lock:
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(delay, self._run_scheduled_flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+    
+    def _run_scheduled_flush(self):
+        """Timer body of schedule_flush: flush, counting failures"""
+        with self.lock:
+            # Edits from here on schedule the next flush
+            self._flush_timer = None
+            try:
+                success = self.flush_pending()
+            except Exception as e:
+                print(f"Error flushing changes: {e}")
+                success = False
+            if not success:
+                self.flush_failures += 1
+    
+    def export_csv(self):
+        """Export all dataframes to the CSV files"""
+        with self.lock:
+            try:
+                pilots = self.pilots_df.copy()
+                pilots['available_from'] = pilots['available_from'].dt.strftime('%Y-%m-%d')
+                pilots.to_csv(os.path.join(self.data_dir, "pilot_roster.csv"), index=False)
+            
+                drones = self.drones_df.copy()
+                drones['maintenance_due'] = drones['maintenance_due'].dt.strftime('%Y-%m-%d')
+                drones.to_csv(os.path.join(self.data_dir, "drone_fleet.csv"), index=False)
+            
+                missions = self.missions_df.copy()
+                missions['start_date'] = missions['start_date'].dt.strftime('%Y-%m-%d')
+                missions['end_date'] = missions['end_date'].dt.strftime('%Y-%m-%d')
+                missions.to_csv(os.path.join(self.data_dir, "missions.csv"), index=False)
+                return True
+            except Exception as e:
+                print(f"Error exporting CSV: {e}")
+                return False
     
     def update_mission_assignment(self, project_id, pilot_id=None, drone_id=None):
         """Update mission with assigned pilot and/or drone"""
-        idx = self.missions_df[self.missions_df['project_id'] == project_id].index
-        if len(idx) > 0:
-            if pilot_id:
-                self.missions_df.loc[idx[0], 'assigned_pilot'] = pilot_id
-            if drone_id:
-                self.missions_df.loc[idx[0], 'assigned_drone'] = drone_id
-            return True
-        return False
+        updates = {}
+        if pilot_id:
+            updates['assigned_pilot'] = pilot_id
+        if drone_id:
+            updates['assigned_drone'] = drone_id
+        return self.update_row('missions', 'project_id', project_id, updates)
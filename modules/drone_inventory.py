@@ -1,4 +1,18 @@
-from datetime import datetime
+from datetime import datetime, timedelta
+import numpy as np
+
+from modules.data_loader import UNASSIGNED, split_items, item_set
+
+# Keys of the drone details dict and the columns they come from
+DRONE_DETAIL_FIELDS = {
+    'id': 'drone_id',
+    'model': 'model',
+    'capabilities': 'capabilities',
+    'status': 'status',
+    'location': 'location',
+    'current_assignment': 'current_assignment',
+    'maintenance_due': 'maintenance_due'
+}
 
 class DroneInventory:
     """Manage drone fleet inventory"""
@@ -8,94 +22,77 @@ class DroneInventory:
     
     def get_available_drones(self):
         """Get all available drones"""
-        drones = self.data_loader.get_drones()
+        drones = self.data_loader.get_drones_view()
         return drones[drones['status'] == 'Available']
     
     def get_drones_by_capability(self, capability):
         """Get drones with specific capability"""
-        drones = self.data_loader.get_drones()
-        matching = []
-        for idx, drone in drones.iterrows():
-            capabilities = [c.strip() for c in str(drone['capabilities']).split(',')]
-            if capability in capabilities:
-                matching.append(drone)
-        
-        if matching:
-            import pandas as pd
-            return pd.DataFrame(matching)
-        
-        import pandas as pd
-        return pd.DataFrame()
+        drones = self.data_loader.get_drones_view()
+        capabilities = drones['capabilities']
+        # Blank (NaN) cells have no capabilities; a bool array (not a list) keeps the columns on an empty fleet
+        mask = np.fromiter(
+            (has_value and capability in item_set(caps)
+             for caps, has_value in zip(capabilities.to_numpy(), capabilities.notna().to_numpy())),
+            dtype=bool, count=len(drones)
+        )
+        return drones[mask]
     
     def get_drones_by_location(self, location):
         """Get drones in specific location"""
-        drones = self.data_loader.get_drones()
+        drones = self.data_loader.get_drones_view()
         return drones[drones['location'] == location]
     
     def get_drones_by_status(self, status):
         """Get drones by status"""
-        drones = self.data_loader.get_drones()
+        drones = self.data_loader.get_drones_view()
         return drones[drones['status'] == status]
     
     def get_drone_details(self, drone_id):
         """Get detailed info for a drone"""
         drone = self.data_loader.get_drone_by_id(drone_id)
         if drone is not None:
-            return {
-                'id': drone['drone_id'],
-                'model': drone['model'],
-                'capabilities': drone['capabilities'],
-                'status': drone['status'],
-                'location': drone['location'],
-                'current_assignment': drone['current_assignment'],
-                'maintenance_due': drone['maintenance_due']
-            }
+            row = dict(zip(drone.index, drone.to_numpy()))
+            return {key: row[column] for key, column in DRONE_DETAIL_FIELDS.items()}
         return None
     
     def get_maintenance_due_soon(self, days=30):
         """Get drones with maintenance due soon"""
-        from datetime import datetime, timedelta
-        drones = self.data_loader.get_drones()
+        drones = self.data_loader.get_drones_view()
         today = datetime.now()
         threshold = today + timedelta(days=days)
         
-        maintenance_due = []
-        for idx, drone in drones.iterrows():
-            maint_date = drone['maintenance_due']
-            if maint_date < threshold:
-                maintenance_due.append({
-                    'drone_id': drone['drone_id'],
-                    'model': drone['model'],
-                    'maintenance_due': maint_date,
-                    'days_until': (maint_date - today).days
-                })
-        
-        return maintenance_due
+        mask = (drones['maintenance_due'] < threshold).to_numpy()
+        maintenance_due = drones.loc[mask, ['drone_id', 'model', 'maintenance_due']]
+        maintenance_due = maintenance_due.assign(days_until=(maintenance_due['maintenance_due'] - today).dt.days)
+        return maintenance_due.to_dict('records')
     
     def find_best_drone_for_mission(self, required_capabilities, location):
         """Find best drone match for mission requirements"""
-        drones = self.data_loader.get_drones()
+        drones = self.data_loader.get_drones_view()
         available = drones[drones['status'] == 'Available']
+        required_caps = split_items(required_capabilities)
+        
+        # Count matching capabilities once per distinct capability string, then score every drone as arrays
+        capabilities = available['capabilities'].to_numpy()
+        counts = {caps: sum(1 for cap in required_caps if cap in item_set(caps)) for caps in set(capabilities)}
+        cap_match = np.fromiter((counts[caps] for caps in capabilities), dtype=int, count=len(capabilities))
+        location_match = (available['location'].to_numpy() == location).astype(int)
+        score = cap_match * 2 + location_match * 0.5
+        
+        # Stable sort keeps the roster order between equal scores
+        matches = np.flatnonzero(cap_match > 0)
+        order = matches[np.argsort(-score[matches], kind='stable')]
         
-        best_matches = []
-        for idx, drone in available.iterrows():
-            drone_caps = [c.strip() for c in str(drone['capabilities']).split(',')]
-            required_caps = [c.strip() for c in str(required_capabilities).split(',')]
-            
-            cap_match = sum(1 for cap in required_caps if cap in drone_caps)
-            location_match = 1 if drone['location'] == location else 0
-            
-            if cap_match > 0:
-                score = cap_match * 2 + location_match * 0.5
-                best_matches.append({
-                    'drone_id': drone['drone_id'],
-                    'model': drone['model'],
-                    'score': score,
-                    'cap_match': cap_match,
-                    'location_match': location_match
-                })
+        drone_ids = available['drone_id'].to_numpy()
+        models = available['model'].to_numpy()
+        best_matches = [{
+            'drone_id': drone_ids[i],
+            'model': models[i],
+            'score': float(score[i]),
+            'cap_match': int(cap_match[i]),
+            'location_match': int(location_match[i])
+        } for i in order]
         
-        best_matches.sort(key=lambda x: x['score'], reverse=True)
         return best_matches
     
     def assign_drone(self, drone_id, project_id):
@@ -107,14 +104,14 @@ class DroneInventory:
     
     def mark_drone_available(self, drone_id):
         """Mark drone as available"""
-        success = self.data_loader.update_drone_status(drone_id, 'Available', '–')
+        success = self.data_loader.update_drone_status(drone_id, 'Available', UNASSIGNED)
         if success:
             return {'success': True, 'message': f'Drone {drone_id} marked available'}
         return {'success': False, 'message': f'Drone {drone_id} not found'}
     
     def mark_drone_maintenance(self, drone_id):
         """Mark drone as in maintenance"""
-        success = self.data_loader.update_drone_status(drone_id, 'Maintenance', '–')
+        success = self.data_loader.update_drone_status(drone_id, 'Maintenance', UNASSIGNED)
         if success:
             return {'success': True, 'message': f'Drone {drone_id} marked for maintenance'}
         return {'success': False, 'message': f'Drone {drone_id} not found'}
@@ -1,106 +1,138 @@
 from datetime import datetime
+import numpy as np
+
+from modules.data_loader import UNASSIGNED, split_items, item_set, membership_matrix, match_counts
+
+# Roster query masks kept per data version (oldest dropped first)
+MASK_CACHE_SIZE = 128
+
+# Keys of the pilot details dict and the columns they come from
+PILOT_DETAIL_FIELDS = {
+    'id': 'pilot_id',
+    'name': 'name',
+    'skills': 'skills',
+    'certifications': 'certifications',
+    'location': 'location',
+    'status': 'status',
+    'current_assignment': 'current_assignment',
+    'available_from': 'available_from'
+}
+
+def _row_sets(column):
+    """Per-row item sets of a comma-separated column, blank (NaN) cells having no items"""
+    present = column.notna().to_numpy()
+    return [item_set(value) if has_value else frozenset() for value, has_value in zip(column.to_numpy(), present)]
 
 class RosterManager:
     """Manage pilot roster operations"""
     
     def __init__(self, data_loader):
         self.data_loader = data_loader
+        # (data_version, per-version state), replaced as a whole; only read or filled under the loader lock
+        self._cache = (None, None)
+    
+    def _state(self):
+        """Roster-derived data for the current data version (call with the loader lock held)
+        
+        {'pilots': frame, 'skill_sets'/'cert_sets': per-row frozensets,
+         'skill_matrix'/'cert_matrix': membership matrices (built on first use), 'masks': {query: row mask}}
+        """
+        version, state = self._cache
+        if version != self.data_loader.data_version:
+            pilots = self.data_loader.get_pilots_view()
+            state = {
+                'pilots': pilots,
+                'skill_sets': _row_sets(pilots['skills']),
+                'cert_sets': _row_sets(pilots['certifications']),
+                'masks': {}
+            }
+            self._cache = (self.data_loader.data_version, state)
+        return state
+    
+    def _matrices(self, state):
+        """Skill and certification ({item: column}, rows x items bool matrix), built once per state"""
+        if 'skill_matrix' not in state:
+            state['skill_matrix'] = membership_matrix(state['skill_sets'])
+            state['cert_matrix'] = membership_matrix(state['cert_sets'])
+        return state['skill_matrix'], state['cert_matrix']
+    
+    def _query(self, key, build):
+        """Pilots matching a roster query; its row mask (build(state)) is reused until the data version changes"""
+        with self.data_loader.lock:
+            state = self._state()
+            masks = state['masks']
+            mask = masks.get(key)
+            if mask is None:
+                if len(masks) >= MASK_CACHE_SIZE:
+                    masks.pop(next(iter(masks)))  # Drop the oldest query
+                mask = masks[key] = np.asarray(build(state), dtype=bool)
+            return state['pilots'][mask]
     
     def get_available_pilots(self):
         """Get all available pilots"""
-        pilots = self.data_loader.get_pilots()
-        return pilots[pilots['status'] == 'Available']
+        return self.get_pilots_by_status('Available')
     
     def get_pilots_by_skill(self, skill):
         """Get pilots with specific skill"""
-        pilots = self.data_loader.get_pilots()
         # Skills are comma-separated
-        matching = []
-        for idx, pilot in pilots.iterrows():
-            skills = [s.strip() for s in str(pilot['skills']).split(',')]
-            if skill in skills:
-                matching.append(pilot)
-        
-        if matching:
-            import pandas as pd
-            return pd.DataFrame(matching)
-        
-        import pandas as pd
-        return pd.DataFrame()
+        return self._query(('skill', skill), lambda state: [skill in skills for skills in state['skill_sets']])
     
     def get_pilots_by_certification(self, cert):
         """Get pilots with specific certification"""
-        pilots = self.data_loader.get_pilots()
-        matching = []
-        for idx, pilot in pilots.iterrows():
-            certs = [c.strip() for c in str(pilot['certifications']).split(',')]
-            if cert in certs:
-                matching.append(pilot)
-        
-        if matching:
-            import pandas as pd
-            return pd.DataFrame(matching)
-        
-        import pandas as pd
-        return pd.DataFrame()
+        return self._query(('cert', cert), lambda state: [cert in certs for certs in state['cert_sets']])
     
     def get_pilots_by_location(self, location):
         """Get pilots in specific location"""
-        pilots = self.data_loader.get_pilots()
-        return pilots[pilots['location'] == location]
+        return self._query(('location', location), lambda state: state['pilots']['location'] == location)
     
     def get_pilots_by_status(self, status):
         """Get pilots by status (Available/On Leave/Assigned/Unavailable)"""
-        pilots = self.data_loader.get_pilots()
-        return pilots[pilots['status'] == status]
+        return self._query(('status', status), lambda state: state['pilots']['status'] == status)
     
     def get_pilot_details(self, pilot_id):
         """Get detailed info for a pilot"""
         pilot = self.data_loader.get_pilot_by_id(pilot_id)
         if pilot is not None:
-            return {
-                'id': pilot['pilot_id'],
-                'name': pilot['name'],
-                'skills': pilot['skills'],
-                'certifications': pilot['certifications'],
-                'location': pilot['location'],
-                'status': pilot['status'],
-                'current_assignment': pilot['current_assignment'],
-                'available_from': pilot['available_from']
-            }
+            row = dict(zip(pilot.index, pilot.to_numpy()))
+            return {key: row[column] for key, column in PILOT_DETAIL_FIELDS.items()}
         return None
     
-    def find_best_pilot_for_mission(self, required_skills, required_certs, location):
-        """Find best pilot match for mission requirements"""
-        pilots = self.data_loader.get_pilots()
-        available = pilots[pilots['status'] == 'Available']
+    def find_best_pilot_for_mission(self, required_skills, required_certs, location, top_k=None):
+        """Find best pilot match for mission requirements (only the top_k best when given)"""
+        required_skills_list = split_items(required_skills)
+        required_certs_list = split_items(required_certs)
         
-        best_matches = []
-        for idx, pilot in available.iterrows():
-            # Check skills
-            pilot_skills = [s.strip() for s in str(pilot['skills']).split(',')]
-            pilot_certs = [c.strip() for c in str(pilot['certifications']).split(',')]
+        with self.data_loader.lock:
+            state = self._state()
+            pilots = state['pilots']
+            available = np.flatnonzero((pilots['status'] == 'Available').to_numpy())
             
-            required_skills_list = [s.strip() for s in str(required_skills).split(',')]
-            required_certs_list = [c.strip() for c in str(required_certs).split(',')]
-            
-            skill_match = sum(1 for skill in required_skills_list if skill in pilot_skills)
-            cert_match = sum(1 for cert in required_certs_list if cert in pilot_certs)
-            location_match = 1 if pilot['location'] == location else 0
-            
-            if skill_match > 0 and cert_match == len(required_certs_list):
-                score = skill_match * 2 + cert_match * 1.5 + location_match * 0.5
-                best_matches.append({
-                    'pilot_id': pilot['pilot_id'],
-                    'name': pilot['name'],
-                    'score': score,
-                    'skills_match': skill_match,
-                    'cert_match': cert_match,
-                    'location_match': location_match
-                })
+            # Score every available pilot at once from the cached membership matrices
+            skills, certs = self._matrices(state)
+            skill_match = match_counts(*skills, required_skills_list, available)
+            cert_match = match_counts(*certs, required_certs_list, available)
+            location_match = (pilots['location'].to_numpy()[available] == location).astype(int)
+            pilot_ids = pilots['pilot_id'].to_numpy()
+            names = pilots['name'].to_numpy()
+        
+        score = skill_match * 2 + cert_match * 1.5 + location_match * 0.5
+        
+        # Sort by score descending, stable so equal scores keep roster order
+        valid = np.flatnonzero((skill_match > 0) & (cert_match == len(required_certs_list)))
+        if top_k is not None and 0 < top_k < len(valid):
+            # Partial selection: keep only pilots scoring at least the top_k-th best, ties included
+            kth_best = -np.partition(-score[valid], top_k - 1)[top_k - 1]
+            valid = valid[score[valid] >= kth_best]
+        order = valid[np.argsort(-score[valid], kind='stable')][:top_k]
         
-        # Sort by score descending
-        best_matches.sort(key=lambda x: x['score'], reverse=True)
+        best_matches = [{
+            'pilot_id': pilot_ids[available[i]],
+            'name': names[available[i]],
+            'score': float(score[i]),
+            'skills_match': int(skill_match[i]),
+            'cert_match': int(cert_match[i]),
+            'location_match': int(location_match[i])
+        } for i in order]
         return best_matches
     
     def update_pilot_assignment(self, pilot_id, project_id, status='Assigned'):
@@ -122,7 +154,7 @@ class RosterManager:
         success = self.data_loader.update_pilot_status(pilot_id, 'On Leave', current_assignment, available_from_date)
         
         if success:
-            if current_assignment != '–':
+            if current_assignment != UNASSIGNED:
                 return {
                     'success': True, 
                     'message': f'⚠️ Pilot {pilot_id} marked on leave. CONFLICT: Still assigned to {current_assignment} - please reassign!',
@@ -134,7 +166,7 @@ class RosterManager:
     
     def mark_pilot_available(self, pilot_id):
         """Mark pilot as available"""
-        success = self.data_loader.update_pilot_status(pilot_id, 'Available', '–')
+        success = self.data_loader.update_pilot_status(pilot_id, 'Available', UNASSIGNED)
         if success:
             return {'success': True, 'message': f'Pilot {pilot_id} marked available'}
         return {'success': False, 'message': f'Pilot {pilot_id} not found'}
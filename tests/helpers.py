@@ -0,0 +1,101 @@
+"""Shared fixtures: a loader over in-memory frames, random roster/fleet/mission tables and Sheets fakes"""
+import random
+
+import pandas as pd
+from gspread import utils as gspread_utils
+from gspread.worksheet import Worksheet
+
+from modules.data_loader import DataLoader, UNASSIGNED
+
+SKILLS = ['Mapping', 'Survey', 'Inspection', 'Thermal', ' Mapping ']
+CERTS = ['DGCA', 'Night Ops', 'BVLOS']
+LOCATIONS = ['Bangalore', 'Mumbai', 'Delhi']
+NAN = float('nan')
+
+
+class FrameLoader(DataLoader):
+    """DataLoader over the given pilots, drones and missions frames instead of files"""
+
+    def __init__(self, pilots, drones, missions):
+        self.frames = (pilots, drones, missions)
+        super().__init__(data_dir=None)
+
+    def _load_tables(self):
+        self.pilots_df, self.drones_df, self.missions_df = (df.copy() for df in self.frames)
+        self._to_categories()
+
+
+def random_tables(seed):
+    """Small random (pilots, drones, missions) frames with repeated ids, blanks and dangling assignments"""
+    rng = random.Random(seed)
+    project_ids = [f"PRJ{rng.randint(0, 8)}" for _ in range(rng.randint(0, 6))]
+    assignment = lambda: rng.choice([UNASSIGNED] + [f"PRJ{i}" for i in range(9)])
+    missions = pd.DataFrame({
+        'project_id': project_ids,
+        'client': [f"Client {i}" for i in range(len(project_ids))],
+        'location': [rng.choice(LOCATIONS + [NAN]) for _ in project_ids],
+        'required_skills': [rng.choice([', '.join(rng.sample(SKILLS, rng.randint(1, 3))), NAN]) for _ in project_ids],
+        'required_certs': [', '.join(rng.sample(CERTS, rng.randint(1, 2))) for _ in project_ids],
+        'start_date': pd.to_datetime(['2026-02-06'] * len(project_ids)),
+        'end_date': pd.to_datetime(['2026-02-08'] * len(project_ids)),
+        'priority': [rng.choice(['Urgent', 'High', 'Standard']) for _ in project_ids]
+    })
+    n = rng.randint(0, 8)
+    pilots = pd.DataFrame({
+        'pilot_id': [f"P{rng.randint(0, 5)}" for _ in range(n)],
+        'name': [f"Pilot {i}" for i in range(n)],
+        'skills': [', '.join(rng.sample(SKILLS, rng.randint(0, 3))) for _ in range(n)],
+        'certifications': [', '.join(rng.sample(CERTS, rng.randint(1, 3))) for _ in range(n)],
+        'location': [rng.choice(LOCATIONS + [NAN]) for _ in range(n)],
+        'status': [rng.choice(['Available', 'On Leave', 'Unavailable', 'Assigned']) for _ in range(n)],
+        'current_assignment': [assignment() for _ in range(n)],
+        'available_from': pd.to_datetime(['2026-02-05'] * n)
+    })
+    n = rng.randint(0, 5)
+    drones = pd.DataFrame({
+        'drone_id': [f"D{i}" for i in range(n)],
+        'model': [f"Model {rng.randint(0, 3)}" for _ in range(n)],
+        'capabilities': [', '.join(rng.sample(['LiDAR', 'RGB', 'Thermal'], rng.randint(1, 2))) for _ in range(n)],
+        'status': [rng.choice(['Available', 'Maintenance', 'Deployed']) for _ in range(n)],
+        'location': [rng.choice(LOCATIONS) for _ in range(n)],
+        'current_assignment': [assignment() for _ in range(n)],
+        'maintenance_due': pd.to_datetime(['2026-03-01'] * n)
+    })
+    return pilots, drones, missions
+
+
+class FakeWorksheet:
+    """Worksheet stand-in serving fixed values through gspread's own get_all_records"""
+
+    get_all_records = Worksheet.get_all_records
+
+    def __init__(self, title, values=None):
+        self.title = title
+        self.values = values or []
+
+    def get(self, *args, **kwargs):
+        return gspread_utils.fill_gaps(self.values) if self.values else [[]]
+
+    def clear(self):
+        self.values = []
+
+
+class FakeSpreadsheet:
+    """Spreadsheet stand-in recording batch calls"""
+
+    def __init__(self):
+        self.sheets = {}
+        self.calls = []
+
+    def worksheet(self, title):
+        return self.sheets.setdefault(title, FakeWorksheet(title))
+
+    def values_batch_clear(self, body):
+        self.calls.append(('clear', body['ranges']))
+
+    def values_batch_update(self, body):
+        self.calls.append(('update', [data['range'] for data in body['data']]))
+        return {'totalUpdatedCells': 1}
+
+    def values_update(self, *args, **kwargs):
+        self.calls.append(('values_update', args[0]))
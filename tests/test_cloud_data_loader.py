@@ -0,0 +1,52 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from modules.cloud_data_loader import CloudDataLoader
+from utils.sheets_sync import GoogleSheetsSync
+from tests.helpers import FakeSpreadsheet
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class FailingSpreadsheet(FakeSpreadsheet):
+    """Spreadsheet whose batch update fails until told otherwise"""
+
+    failing = True
+
+    def values_batch_update(self, body):
+        if self.failing:
+            raise RuntimeError('quota exceeded')
+        return super().values_batch_update(body)
+
+
+class FlushPendingTest(unittest.TestCase):
+    """Edits queued in a sheet batch that fails stay pending and go out with the next flush"""
+
+    def setUp(self):
+        data_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, data_dir)
+        for name in ['pilot_roster', 'drone_fleet', 'missions']:
+            shutil.copy(os.path.join(REPO_DIR, f"{name}.csv"), data_dir)
+        self.sync = GoogleSheetsSync()
+        self.sync.spreadsheet = FailingSpreadsheet()
+        self.loader = CloudDataLoader(data_dir)
+        self.loader.use_sheets = True
+        self.loader.sheets_sync = self.sync
+
+    def test_failed_batch_keeps_rows_dirty(self):
+        self.loader.update_pilot_status('P001', 'On Leave')
+        self.loader.update_drone_status('D001', 'Available')
+        self.assertFalse(self.loader.flush_pending())
+        self.assertEqual(self.loader._dirty['pilots'], {'P001'})
+        self.assertEqual(self.loader._dirty['drones'], {'D001'})
+
+        self.sync.spreadsheet.failing = False
+        self.assertTrue(self.loader.flush_pending())
+        self.assertFalse(any(self.loader._dirty.values()))
+        self.assertEqual(self.sync.spreadsheet.calls[-1], ('update', ["'Pilot Roster'!A1", "'Drone Fleet'!A1"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
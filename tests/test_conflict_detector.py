@@ -0,0 +1,84 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from modules.conflict_detector import ConflictDetector
+from modules.data_loader import DataLoader
+from tests.helpers import FrameLoader, random_tables
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Results of the original iterrows detectors on the seed CSVs and on random_tables(0..19)
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'conflicts.json')
+
+DETECTORS = [
+    'detect_pilot_double_booking',
+    'detect_skill_mismatch',
+    'detect_certification_mismatch',
+    'detect_location_mismatch',
+    'detect_maintenance_conflict',
+    'detect_urgent_mission_conflicts'
+]
+
+
+def normalize(value):
+    """Detector results as plain JSON values (NaN as None), to compare with the pinned fixtures"""
+    if isinstance(value, dict):
+        return {key: normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [normalize(item) for item in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and value != value:
+        return None
+    return value
+
+
+class ConflictParityTest(unittest.TestCase):
+    """The vectorized detectors report exactly what the original iterrows scans did"""
+
+    @classmethod
+    def setUpClass(cls):
+        with open(FIXTURES, encoding='utf-8') as f:
+            cls.expected = json.load(f)
+
+    def assert_conflicts(self, loader, expected):
+        detector = ConflictDetector(loader)
+        for name in DETECTORS:
+            with self.subTest(detector=name):
+                self.assertEqual(normalize(getattr(detector, name)()), expected[name])
+        with self.subTest(detector='get_all_conflicts'):
+            self.assertEqual([c['issue'] for c in detector.get_all_conflicts()], expected['get_all_conflicts'])
+        for mission_id, name in expected['find_best_replacement_pilot'].items():
+            with self.subTest(replacement=mission_id):
+                replacement = detector.find_best_replacement_pilot(mission_id)
+                self.assertEqual(None if replacement is None else replacement['name'], name)
+
+    def test_random_tables(self):
+        for seed, expected in enumerate(self.expected['random_tables']):
+            with self.subTest(seed=seed):
+                self.assert_conflicts(FrameLoader(*random_tables(seed)), expected)
+
+    def test_seed_data(self):
+        data_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, data_dir)
+        for name in ['pilot_roster', 'drone_fleet', 'missions']:
+            shutil.copy(os.path.join(REPO_DIR, f"{name}.csv"), data_dir)
+        self.assert_conflicts(DataLoader(data_dir), self.expected['seed_data'])
+
+    def test_cache_follows_edits(self):
+        loader = FrameLoader(*random_tables(3))
+        detector = ConflictDetector(loader)
+        detector.get_all_conflicts()
+        for pilot_id in loader.pilots_df['pilot_id'].unique():
+            loader.update_pilot_status(pilot_id, 'On Leave', 'PRJ1')
+        self.assertEqual(normalize(detector.get_all_conflicts()),
+                         normalize(ConflictDetector(loader).get_all_conflicts()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import threading
+import time
+import unittest
+
+from tests.helpers import FrameLoader, random_tables
+
+
+class ScheduleFlushTest(unittest.TestCase):
+    """schedule_flush runs one delayed flush for every edit made before it starts"""
+
+    def setUp(self):
+        self.loader = FrameLoader(*random_tables(2))
+        self.flushes = []
+        self.flushed = threading.Event()
+        flush_pending = self.loader.flush_pending
+
+        def counted_flush():
+            self.flushes.append(True)
+            try:
+                return flush_pending()
+            finally:
+                self.flushed.set()
+
+        self.loader.flush_pending = counted_flush
+
+    def test_edits_share_one_flush(self):
+        for _ in range(3):
+            self.loader.schedule_flush(0.05)
+        self.assertTrue(self.flushed.wait(5))
+        time.sleep(0.2)  # Long enough for any second timer to have fired
+        self.assertEqual(len(self.flushes), 1)
+
+    def test_failed_flush_is_counted(self):
+        # FrameLoader has no data directory, so saving fails
+        pilot_id = self.loader.pilots_df['pilot_id'].iloc[0]
+        self.loader.update_pilot_status(pilot_id, 'On Leave')
+        self.loader.schedule_flush(0.01)
+        self.assertTrue(self.flushed.wait(5))
+        with self.loader.lock:
+            self.assertEqual(self.loader.flush_failures, 1)
+            self.assertEqual(self.loader._dirty['pilots'], {pilot_id})
+
+
+if __name__ == '__main__':
+    unittest.main()
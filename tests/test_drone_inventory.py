@@ -0,0 +1,24 @@
+import unittest
+
+from modules.drone_inventory import DroneInventory
+from tests.helpers import FrameLoader, random_tables
+
+
+class CapabilityTest(unittest.TestCase):
+    """get_drones_by_capability matches whole items, skips blank cells and keeps the columns"""
+
+    def test_capability_filter(self):
+        pilots, drones, missions = random_tables(1)
+        drones = drones.head(3).assign(capabilities=['LiDAR, RGB', float('nan'), 'Thermal LiDAR'])
+        matches = DroneInventory(FrameLoader(pilots, drones, missions)).get_drones_by_capability('LiDAR')
+        self.assertEqual(matches['drone_id'].tolist(), [drones['drone_id'].iloc[0]])
+
+    def test_empty_fleet_keeps_columns(self):
+        pilots, drones, missions = random_tables(1)
+        matches = DroneInventory(FrameLoader(pilots, drones.head(0), missions)).get_drones_by_capability('RGB')
+        self.assertTrue(matches.empty)
+        self.assertEqual(list(matches.columns), list(drones.columns))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import itertools
+import unittest
+
+from utils.llm_handler import CONTEXT_MARKER, INTENT_KEYWORDS, LLMHandler
+
+
+class HistoryTest(unittest.TestCase):
+    """Stored turns keep a marker where the state snapshot was sent, never the snapshot itself"""
+
+    def test_context_marker(self):
+        handler = LLMHandler(api_key='')
+        handler._remember('Who is free?', 'Neha', context_data='pilots: ...')
+        handler._remember('Thanks', 'You are welcome')
+        messages = handler._build_messages('And drones?', 'drones: ...')
+        self.assertEqual([m['content'] for m in messages[1:]], [
+            'Who is free?' + CONTEXT_MARKER,
+            'Neha',
+            'Thanks',
+            'You are welcome',
+            'And drones?\n\n[Current System State]\ndrones: ...'
+        ])
+
+
+class ParseIntentTest(unittest.TestCase):
+    """parse_intent's single regex pass finds the same intents as one substring test per keyword"""
+
+    def reference_intents(self, message):
+        message_lower = message.lower()
+        intents = [intent for intent, keywords in INTENT_KEYWORDS.items()
+                   if any(keyword in message_lower for keyword in keywords)]
+        return intents or ['general']
+
+    def test_matches_substring_scan(self):
+        handler = LLMHandler(api_key='')
+        keywords = [keyword for words in INTENT_KEYWORDS.values() for keyword in words]
+        messages = ['', 'Hello there', 'Show me the MISMATCH list', 'reassigned?', 'statuses of the fleet']
+        messages += [f"Please {a} the {b}" for a, b in itertools.product(keywords, repeat=2)]
+        for message in messages:
+            with self.subTest(message=message):
+                self.assertEqual(handler.parse_intent(message), self.reference_intents(message))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import random
+import unittest
+
+from modules.roster_manager import RosterManager
+from tests.helpers import CERTS, LOCATIONS, SKILLS, FrameLoader, random_tables
+
+
+def reference_best_pilots(pilots, required_skills, required_certs, location):
+    """The original per-pilot loop of find_best_pilot_for_mission"""
+    required_skills_list = [s.strip() for s in str(required_skills).split(',')]
+    required_certs_list = [c.strip() for c in str(required_certs).split(',')]
+    best_matches = []
+    for _, pilot in pilots[pilots['status'] == 'Available'].iterrows():
+        pilot_skills = [s.strip() for s in str(pilot['skills']).split(',')]
+        pilot_certs = [c.strip() for c in str(pilot['certifications']).split(',')]
+        skill_match = sum(1 for skill in required_skills_list if skill in pilot_skills)
+        cert_match = sum(1 for cert in required_certs_list if cert in pilot_certs)
+        location_match = 1 if pilot['location'] == location else 0
+        if skill_match > 0 and cert_match == len(required_certs_list):
+            best_matches.append({
+                'pilot_id': pilot['pilot_id'],
+                'name': pilot['name'],
+                'score': skill_match * 2 + cert_match * 1.5 + location_match * 0.5,
+                'skills_match': skill_match,
+                'cert_match': cert_match,
+                'location_match': location_match
+            })
+    best_matches.sort(key=lambda x: x['score'], reverse=True)
+    return best_matches
+
+
+class FindBestPilotTest(unittest.TestCase):
+    """find_best_pilot_for_mission ranks pilots exactly like the original loop, top_k keeping its head"""
+
+    def requirements(self, rng):
+        skills = ', '.join(rng.sample(SKILLS + ['Unknown'], rng.randint(1, 3)))
+        certs = rng.choice([', '.join(rng.sample(CERTS, rng.randint(1, 2))), 'DGCA, DGCA', ''])
+        return skills, certs, rng.choice(LOCATIONS)
+
+    def test_matches_reference(self):
+        for seed in range(80):
+            loader = FrameLoader(*random_tables(seed))
+            manager = RosterManager(loader)
+            rng = random.Random(seed)
+            for _ in range(5):
+                args = self.requirements(rng)
+                with self.subTest(seed=seed, requirements=args):
+                    expected = reference_best_pilots(loader.get_pilots(), *args)
+                    self.assertEqual(manager.find_best_pilot_for_mission(*args), expected)
+                    for top_k in (1, 2, 3):
+                        self.assertEqual(manager.find_best_pilot_for_mission(*args, top_k=top_k), expected[:top_k])
+
+    def test_follows_status_updates(self):
+        loader = FrameLoader(*random_tables(5))
+        manager = RosterManager(loader)
+        args = ('Mapping, Survey', 'DGCA', 'Bangalore')
+        manager.find_best_pilot_for_mission(*args)
+        for pilot_id in loader.pilots_df['pilot_id'].unique():
+            loader.update_pilot_status(pilot_id, 'Available')
+        self.assertEqual(manager.find_best_pilot_for_mission(*args), reference_best_pilots(loader.get_pilots(), *args))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+
+import pandas as pd
+
+from utils.sheets_sync import GoogleSheetsSync
+from tests.helpers import FakeSpreadsheet, FakeWorksheet
+
+
+class RecordsFrameTest(unittest.TestCase):
+    """_records_frame builds the frame pd.DataFrame(get_all_records()) would"""
+
+    def test_matches_get_all_records(self):
+        sync = GoogleSheetsSync()
+        cases = [
+            [],
+            [['pilot_id', 'name']],
+            [['pilot_id', 'name', 'score'], ['P001', 'Arjun', '5'], ['P002', 'Neha'], ['P003', '', '2.5']],
+            [['drone_id', 'model', 'due'], ['D001', 'DJI M300', '2026-03-01'], []],
+        ]
+        for values in cases:
+            with self.subTest(values=values):
+                expected = pd.DataFrame(FakeWorksheet('Sheet', values).get_all_records())
+                frame = sync._records_frame(values)
+                pd.testing.assert_frame_equal(frame, expected)
+
+
+class BatchTest(unittest.TestCase):
+    """Nested begin_batch blocks join the outer batch, which commits once"""
+
+    def setUp(self):
+        self.sync = GoogleSheetsSync()
+        self.sync.spreadsheet = FakeSpreadsheet()
+        self.df = pd.DataFrame({'pilot_id': ['P001'], 'name': ['Arjun']})
+
+    def test_nested_blocks_commit_once(self):
+        with self.sync.begin_batch() as outer:
+            self.sync.sync_pilots_to_sheet(self.df)
+            with self.sync.begin_batch() as inner:
+                self.sync.sync_drones_to_sheet(self.df)
+            self.assertEqual(self.sync.spreadsheet.calls, [])
+        self.assertTrue(inner['success'])
+        self.assertTrue(outer['success'])
+        self.assertEqual(self.sync.spreadsheet.calls, [
+            ('clear', ["'Pilot Roster'", "'Drone Fleet'"]),
+            ('update', ["'Pilot Roster'!A1", "'Drone Fleet'!A1"])
+        ])
+
+    def test_writes_after_batch_go_out_directly(self):
+        with self.sync.begin_batch():
+            pass
+        self.assertTrue(self.sync.sync_missions_to_sheet(self.df)['success'])
+        self.assertEqual(self.sync.spreadsheet.calls, [('values_update', "'Missions'!A1")])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,19 @@
 # Skylark Drones Utils
-from .sheets_sync import GoogleSheetsSync
-from .llm_handler import LLMHandler
+# Submodules are imported on first access so that importing one utility
+# (e.g. utils.llm_handler) doesn't pull in gspread/google-auth as well.
+import importlib
+
+_SUBMODULES = {
+    'GoogleSheetsSync': '.sheets_sync',
+    'LLMHandler': '.llm_handler'
+}
 
 __all__ = [
     'GoogleSheetsSync',
     'LLMHandler'
 ]
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return getattr(importlib.import_module(_SUBMODULES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
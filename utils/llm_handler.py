@@ -1,5 +1,14 @@
 import os
+import re
+from collections import deque
+from functools import lru_cache
 
+# Seconds to wait for a Groq response / for the connection, and retries of transient errors
+GROQ_TIMEOUT = 30.0
+GROQ_CONNECT_TIMEOUT = 5.0
+GROQ_MAX_RETRIES = 2
+
+@lru_cache(maxsize=1)
 def get_groq_api_key():
     """Get Groq API key from Streamlit secrets or environment"""
     try:
@@ -10,28 +19,20 @@ def get_groq_api_key():
         pass
     return os.getenv('GROQ_API_KEY')
 
-class LLMHandler:
-    """Handle conversational interface with Groq LLM"""
-    
-    def __init__(self, api_key=None):
-        self.api_key = api_key or get_groq_api_key()
-        self.client = None
-        self.conversation_history = []
-        
-        # Try to initialize Groq client
-        try:
-            from groq import Groq
-            if self.api_key:
-                self.client = Groq(api_key=self.api_key)
-            else:
-                self.client = None
-        except Exception as e:
-            print(f"Warning: Could not initialize Groq client: {e}")
-            self.client = None
-    
-    def get_system_prompt(self):
-        """Get system prompt for the conversational agent"""
-        return """You are a Drone Operations Coordinator AI Assistant. You help manage a drone operations fleet coordinating pilots, drones, missions, and resource allocation.
+@lru_cache(maxsize=4)
+def get_groq_client(api_key):
+    """Groq client shared by every LLMHandler with this key, so its connection pool stays warm"""
+    import httpx
+    from groq import Groq
+    # Bounded waits, and retries of transient failures (connection errors, 429, 5xx) with backoff
+    return Groq(
+        api_key=api_key,
+        timeout=httpx.Timeout(GROQ_TIMEOUT, connect=GROQ_CONNECT_TIMEOUT),
+        max_retries=GROQ_MAX_RETRIES
+    )
+
+# Kept byte-identical across turns so the provider's prompt cache can reuse it
+SYSTEM_PROMPT = """You are a Drone Operations Coordinator AI Assistant. You help manage a drone operations fleet coordinating pilots, drones, missions, and resource allocation.
 
 Your capabilities include:
 1. **Roster Management**: Query pilot availability by skill, certification, location. View/update pilot status.
@@ -55,35 +56,93 @@ Available commands you can reference:
 - "Update [pilot/drone] status"
 
 Format your responses clearly with sections when needed."""
+
+SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+
+# Most recent history messages sent with each turn (user + assistant per exchange)
+MAX_HISTORY_MESSAGES = 20
+
+# Keywords that route a message to each intent
+INTENT_KEYWORDS = {
+    'roster': ['pilot', 'available', 'skill', 'certification', 'location'],
+    'inventory': ['drone', 'fleet', 'capability', 'maintenance', 'model'],
+    'assignment': ['assign', 'match', 'project', 'mission', 'reassign'],
+    'conflict': ['conflict', 'overlap', 'mismatch', 'issue', 'problem'],
+    'status': ['status', 'update', 'change', 'mark']
+}
+
+# One pass over the message for all keywords; the lookahead also finds keywords
+# nested in others (e.g. 'match' in 'mismatch'), like the per-keyword substring test did
+INTENT_PATTERN = re.compile('(?=' + '|'.join(
+    f"(?P<{intent}>{'|'.join(map(re.escape, keywords))})" for intent, keywords in INTENT_KEYWORDS.items()
+) + ')')
+
+# Stands in for the state snapshot in stored turns; only the newest message carries the full snapshot
+CONTEXT_MARKER = "\n\n[Current System State was attached to this message]"
+
+UNAVAILABLE_MESSAGE = "⚠️ **AI Assistant Unavailable**\n\nThe Groq AI assistant is not configured. Please set your `GROQ_API_KEY` environment variable to enable the chat feature.\n\nYou can still use all other features of the application through the sidebar navigation."
+
+class LLMHandler:
+    """Handle conversational interface with Groq LLM
+    
+    Only the newest user message carries the full [Current System State] snapshot; earlier turns keep
+    a short marker in its place, so past answers are read against the state they were given at the time.
+    """
+    
+    def __init__(self, api_key=None):
+        self.api_key = api_key or get_groq_api_key()
+        self.client = None
+        self.conversation_history = deque(maxlen=MAX_HISTORY_MESSAGES)
+        
+        # Try to initialize Groq client
+        try:
+            if self.api_key:
+                self.client = get_groq_client(self.api_key)
+            else:
+                self.client = None
+        except Exception as e:
+            print(f"Warning: Could not initialize Groq client: {e}")
+            self.client = None
+    
+    def get_system_prompt(self):
+        """Get system prompt for the conversational agent"""
+        return SYSTEM_PROMPT
+    
+    def _build_messages(self, user_message, context_data=None):
+        """Build the message list (system prompt, recent history, new message with context)"""
+        # Add context if available
+        if context_data:
+            context_prompt = f"\n\n[Current System State]\n{context_data}"
+            full_message = user_message + context_prompt
+        else:
+            full_message = user_message
+        
+        # System prompt first, then the recent history, then the current user message
+        return [
+            SYSTEM_MESSAGE,
+            *self.conversation_history,
+            {"role": "user", "content": full_message}
+        ]
+    
+    def _remember(self, user_message, assistant_message, context_data=None):
+        """Add a completed exchange to the conversation history, with a marker in place of the state snapshot"""
+        self.conversation_history.append({
+            "role": "user",
+            "content": user_message + CONTEXT_MARKER if context_data else user_message
+        })
+        self.conversation_history.append({
+            "role": "assistant",
+            "content": assistant_message
+        })
     
     def chat(self, user_message, context_data=None):
         """Send a message and get a response from Groq"""
         # Check if client is available
         if self.client is None:
-            return "⚠️ **AI Assistant Unavailable**\n\nThe Groq AI assistant is not configured. Please set your `GROQ_API_KEY` environment variable to enable the chat feature.\n\nYou can still use all other features of the application through the sidebar navigation."
+            return UNAVAILABLE_MESSAGE
         
         try:
-            # Add context if available
-            if context_data:
-                context_prompt = f"\n\n[Current System State]\n{context_data}"
-                full_message = user_message + context_prompt
-            else:
-                full_message = user_message
-            
-            # Build messages with system prompt
-            messages = [
-                {"role": "system", "content": self.get_system_prompt()}
-            ]
-            
-            # Add conversation history
-            for msg in self.conversation_history:
-                messages.append(msg)
-            
-            # Add current user message
-            messages.append({
-                "role": "user",
-                "content": full_message
-            })
+            messages = self._build_messages(user_message, context_data)
             
             # Get response from Groq (using Llama 3.3 70B)
             response = self.client.chat.completions.create(
@@ -96,40 +155,52 @@ Format your responses clearly with sections when needed."""
             assistant_message = response.choices[0].message.content
             
             # Add to conversation history
-            self.conversation_history.append({
-                "role": "user",
-                "content": full_message
-            })
-            self.conversation_history.append({
-                "role": "assistant",
-                "content": assistant_message
-            })
+            self._remember(user_message, assistant_message, context_data)
             
             return assistant_message
         
         except Exception as e:
             return f"Error communicating with AI: {str(e)}"
     
+    def stream(self, user_message, context_data=None):
+        """Send a message and yield the response from Groq as it is generated"""
+        # Check if client is available
+        if self.client is None:
+            yield UNAVAILABLE_MESSAGE
+            return
+        
+        try:
+            messages = self._build_messages(user_message, context_data)
+            
+            response = self.client.chat.completions.create(
+                model="llama-3.3-70b-versatile",
+                messages=messages,
+                max_tokens=1024,
+                temperature=0.7,
+                stream=True
+            )
+            
+            parts = []
+            for chunk in response:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    yield delta
+            
+            # Only completed responses go into the conversation history
+            self._remember(user_message, "".join(parts), context_data)
+        
+        except Exception as e:
+            yield f"Error communicating with AI: {str(e)}"
+    
     def reset_conversation(self):
         """Reset conversation history"""
-        self.conversation_history = []
+        self.conversation_history.clear()
     
     def parse_intent(self, user_message):
         """Parse user intent to route to appropriate handler"""
-        intents = {
-            'roster': ['pilot', 'available', 'skill', 'certification', 'location'],
-            'inventory': ['drone', 'fleet', 'capability', 'maintenance', 'model'],
-            'assignment': ['assign', 'match', 'project', 'mission', 'reassign'],
-            'conflict': ['conflict', 'overlap', 'mismatch', 'issue', 'problem'],
-            'status': ['status', 'update', 'change', 'mark']
-        }
-        
-        message_lower = user_message.lower()
-        detected_intents = []
-        
-        for intent, keywords in intents.items():
-            if any(keyword in message_lower for keyword in keywords):
-                detected_intents.append(intent)
+        found = {match.lastgroup for match in INTENT_PATTERN.finditer(user_message.lower())}
+        detected_intents = [intent for intent in INTENT_KEYWORDS if intent in found]
         
         return detected_intents if detected_intents else ['general']
     
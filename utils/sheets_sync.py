@@ -5,6 +5,16 @@ from google.oauth2.credentials import Credentials
 from google.oauth2 import service_account
 import os
 import json
+import threading
+import time
+from contextlib import contextmanager
+from gspread import utils as gspread_utils
+
+# Seconds a worksheet handle is reused before it is looked up again
+WORKSHEET_TTL = 300
+
+# Worksheet title of each table
+SHEET_TITLES = {'pilots': 'Pilot Roster', 'drones': 'Drone Fleet', 'missions': 'Missions'}
 
 class GoogleSheetsSync:
     """Handle 2-way sync with Google Sheets"""
@@ -15,6 +25,12 @@ class GoogleSheetsSync:
         self.spreadsheet = None
         self.pilot_sheet = None
         self.drone_sheet = None
+        self.mission_sheet = None
+        self._worksheets = {}  # {title: (worksheet, time fetched)}
+        # begin_batch() queue ({sheet title: values}) and nesting depth, per thread since the client is shared
+        self._local = threading.local()
+        # {sheet title: {id: sheet row number}}, built on first status update
+        self._row_indexes = {}
         
         if credentials_json:
             self.authenticate(credentials_json)
@@ -43,45 +59,152 @@ class GoogleSheetsSync:
         """Open a spreadsheet by ID"""
         try:
             self.spreadsheet = self.client.open_by_key(spreadsheet_id)
+            self._worksheets = {}
+            self._row_indexes = {}
             return True
         except Exception as e:
             print(f"Error opening spreadsheet: {e}")
             return False
     
+    def _worksheet(self, title, cols):
+        """Get a worksheet by title (creating it if missing), reusing the handle for WORKSHEET_TTL seconds"""
+        cached = self._worksheets.get(title)
+        if cached and time.monotonic() - cached[1] < WORKSHEET_TTL:
+            return cached[0]
+        try:
+            sheet = self.spreadsheet.worksheet(title)
+        except:
+            # Create if doesn't exist
+            sheet = self.spreadsheet.add_worksheet(title=title, rows=100, cols=cols)
+        self._worksheets[title] = (sheet, time.monotonic())
+        return sheet
+    
     def get_pilot_sheet(self):
         """Get pilot roster worksheet"""
         if self.spreadsheet:
-            try:
-                self.pilot_sheet = self.spreadsheet.worksheet('Pilot Roster')
-                return self.pilot_sheet
-            except:
-                # Create if doesn't exist
-                self.pilot_sheet = self.spreadsheet.add_worksheet(title='Pilot Roster', rows=100, cols=10)
-                return self.pilot_sheet
+            self.pilot_sheet = self._worksheet('Pilot Roster', cols=10)
+            return self.pilot_sheet
         return None
     
     def get_drone_sheet(self):
         """Get drone fleet worksheet"""
         if self.spreadsheet:
-            try:
-                self.drone_sheet = self.spreadsheet.worksheet('Drone Fleet')
-                return self.drone_sheet
-            except:
-                # Create if doesn't exist
-                self.drone_sheet = self.spreadsheet.add_worksheet(title='Drone Fleet', rows=100, cols=10)
-                return self.drone_sheet
+            self.drone_sheet = self._worksheet('Drone Fleet', cols=10)
+            return self.drone_sheet
         return None
     
     def get_mission_sheet(self):
         """Get missions worksheet"""
         if self.spreadsheet:
-            try:
-                return self.spreadsheet.worksheet('Missions')
-            except:
-                # Create if doesn't exist
-                return self.spreadsheet.add_worksheet(title='Missions', rows=100, cols=15)
+            self.mission_sheet = self._worksheet('Missions', cols=15)
+            return self.mission_sheet
         return None
     
+    # ============ BATCHED WRITES ============
+    
+    @contextmanager
+    def begin_batch(self):
+        """Queue sheet syncs made inside the block and commit them in one batch on exit"""
+        # Nested blocks join the outermost batch, which alone commits the queue
+        depth = getattr(self._local, 'depth', 0)
+        self._local.depth = depth + 1
+        if depth == 0:
+            self._local.pending = {}
+        result = {}
+        try:
+            yield result
+            if depth == 0:
+                result.update(self.commit_batch())
+            else:
+                result.update({'success': True, 'message': 'Queued in the enclosing batch'})
+        finally:
+            self._local.depth = depth
+            if depth == 0:
+                self._local.pending = None
+    
+    def _queue_write(self, sheet, df):
+        """Queue a full-sheet write of a dataframe, returns False if not batching"""
+        pending = getattr(self._local, 'pending', None)
+        if pending is None:
+            return False
+        # A later write of the same sheet replaces the queued one
+        pending[sheet.title] = self._sheet_values(df)
+        return True
+    
+    def _sheet_values(self, df):
+        """Header row plus every row of a dataframe as strings"""
+        # One object-array materialization instead of a namedtuple per row; str() per cell
+        # keeps the existing text (astype(str) would drop the time from datetimes and keep NaN)
+        return [list(df.columns)] + [[str(val) for val in row] for row in df.to_numpy(dtype=object).tolist()]
+    
+    def _write_sheet(self, sheet, df):
+        """Replace a sheet's contents with a dataframe in one clear and one values update"""
+        self._row_indexes.pop(sheet.title, None)
+        sheet.clear()
+        self.spreadsheet.values_update(
+            f"'{sheet.title}'!A1",
+            params={'valueInputOption': 'RAW'},
+            body={'values': self._sheet_values(df)}
+        )
+    
+    def commit_batch(self):
+        """Flush queued writes with one batch clear and one values batchUpdate"""
+        pending = getattr(self._local, 'pending', None)
+        if not pending:
+            return {'success': True, 'message': 'No pending sheet writes'}
+        self._local.pending = {}
+        for title in pending:
+            self._row_indexes.pop(title, None)
+        try:
+            self.spreadsheet.values_batch_clear(body={
+                'ranges': [f"'{title}'" for title in pending]
+            })
+            response = self.spreadsheet.values_batch_update(body={
+                'valueInputOption': 'RAW',
+                'data': [{'range': f"'{title}'!A1", 'values': values} for title, values in pending.items()]
+            })
+            return {
+                'success': True,
+                'message': f"Synced {response.get('totalUpdatedCells', 0)} cells in one batch update"
+            }
+        except Exception as e:
+            return {'success': False, 'message': f'Error committing batch: {e}'}
+    
+    def update_rows(self, rows_by_sheet):
+        """Overwrite individual rows ({sheet title: [(row number, values)]}) in one values batchUpdate"""
+        try:
+            response = self.spreadsheet.values_batch_update(body={
+                'valueInputOption': 'RAW',
+                'data': [
+                    {'range': f"'{title}'!A{row_number}", 'values': [values]}
+                    for title, rows in rows_by_sheet.items()
+                    for row_number, values in rows
+                ]
+            })
+            return {
+                'success': True,
+                'message': f"Updated {response.get('totalUpdatedCells', 0)} cells in one batch update"
+            }
+        except Exception as e:
+            return {'success': False, 'message': f'Error updating rows: {e}'}
+    
+    def upload_all(self, dataframes):
+        """Upload whole tables ({'pilots'|'drones'|'missions': df}) in one batch update"""
+        syncs = {
+            'pilots': self.sync_pilots_to_sheet,
+            'drones': self.sync_drones_to_sheet,
+            'missions': self.sync_missions_to_sheet
+        }
+        errors = []
+        with self.begin_batch() as batch:
+            for name, df in dataframes.items():
+                result = syncs[name](df)
+                if not result['success']:
+                    errors.append(result['message'])
+        if errors:
+            return {'success': False, 'message': '; '.join(errors)}
+        return batch
+    
     def sync_pilots_to_sheet(self, pilots_df):
         """Sync pilot data to Google Sheet"""
         try:
@@ -89,17 +212,11 @@ class GoogleSheetsSync:
             if not sheet:
                 return {'success': False, 'message': 'Could not access Pilot Roster sheet'}
             
-            # Clear existing data (keep headers)
-            sheet.clear()
+            if self._queue_write(sheet, pilots_df):
+                return {'success': True, 'message': f'Queued {len(pilots_df)} pilots for batch sync'}
             
-            # Write headers
-            headers = list(pilots_df.columns)
-            sheet.append_row(headers)
-            
-            # Write data
-            for idx, row in pilots_df.iterrows():
-                row_data = [str(val) for val in row.values]
-                sheet.append_row(row_data)
+            # Replace headers and data in one write
+            self._write_sheet(sheet, pilots_df)
             
             return {'success': True, 'message': f'Synced {len(pilots_df)} pilots to Google Sheet'}
         except Exception as e:
@@ -112,22 +229,48 @@ class GoogleSheetsSync:
             if not sheet:
                 return {'success': False, 'message': 'Could not access Drone Fleet sheet'}
             
-            # Clear existing data
-            sheet.clear()
-            
-            # Write headers
-            headers = list(drones_df.columns)
-            sheet.append_row(headers)
+            if self._queue_write(sheet, drones_df):
+                return {'success': True, 'message': f'Queued {len(drones_df)} drones for batch sync'}
             
-            # Write data
-            for idx, row in drones_df.iterrows():
-                row_data = [str(val) for val in row.values]
-                sheet.append_row(row_data)
+            # Replace headers and data in one write
+            self._write_sheet(sheet, drones_df)
             
             return {'success': True, 'message': f'Synced {len(drones_df)} drones to Google Sheet'}
         except Exception as e:
             return {'success': False, 'message': f'Error syncing drones: {e}'}
     
+    def read_all_from_sheets(self):
+        """Read the pilot, drone and mission sheets in one values batchGet ({'pilots': df, ...})"""
+        try:
+            existing = {worksheet.title for worksheet in self.spreadsheet.worksheets()}
+            titles = {name: title for name, title in SHEET_TITLES.items() if title in existing}
+            
+            # Missing sheets are created like the getters do, and read as empty (the loader then uses local files)
+            getters = {'pilots': self.get_pilot_sheet, 'drones': self.get_drone_sheet, 'missions': self.get_mission_sheet}
+            for name in SHEET_TITLES:
+                if name not in titles:
+                    getters[name]()
+            frames = {name: pd.DataFrame() for name in SHEET_TITLES}
+            if titles:
+                response = self.spreadsheet.values_batch_get([f"'{title}'" for title in titles.values()])
+                for name, value_range in zip(titles, response.get('valueRanges', [])):
+                    frames[name] = self._records_frame(value_range.get('values', []))
+            return frames
+        except Exception as e:
+            print(f"Error reading sheets: {e}")
+            return None
+    
+    def _records_frame(self, values):
+        """Build the same dataframe get_all_records() would from raw sheet values"""
+        values = gspread_utils.fill_gaps(values) if values else [[]]
+        if values == [[]]:
+            return pd.DataFrame()
+        rows = [gspread_utils.numericise_all(row) for row in values[1:]]
+        if not rows:
+            return pd.DataFrame()
+        # Straight from the 2D list, without building a header -> value dict per row
+        return pd.DataFrame(rows, columns=values[0])
+    
     def read_pilots_from_sheet(self):
         """Read pilot data from Google Sheet"""
         try:
@@ -135,8 +278,7 @@ class GoogleSheetsSync:
             if not sheet:
                 return None
             
-            data = sheet.get_all_records()
-            return pd.DataFrame(data)
+            return self._records_frame(sheet.get_all_values())
         except Exception as e:
             print(f"Error reading pilots from sheet: {e}")
             return None
@@ -148,8 +290,7 @@ class GoogleSheetsSync:
             if not sheet:
                 return None
             
-            data = sheet.get_all_records()
-            return pd.DataFrame(data)
+            return self._records_frame(sheet.get_all_values())
         except Exception as e:
             print(f"Error reading drones from sheet: {e}")
             return None
@@ -161,8 +302,7 @@ class GoogleSheetsSync:
             if not sheet:
                 return None
             
-            data = sheet.get_all_records()
-            return pd.DataFrame(data)
+            return self._records_frame(sheet.get_all_values())
         except Exception as e:
             print(f"Error reading missions from sheet: {e}")
             return None
@@ -174,22 +314,42 @@ class GoogleSheetsSync:
             if not sheet:
                 return {'success': False, 'message': 'Could not access Missions sheet'}
             
-            # Clear existing data
-            sheet.clear()
+            if self._queue_write(sheet, missions_df):
+                return {'success': True, 'message': f'Queued {len(missions_df)} missions for batch sync'}
             
-            # Write headers
-            headers = list(missions_df.columns)
-            sheet.append_row(headers)
-            
-            # Write data
-            for idx, row in missions_df.iterrows():
-                row_data = [str(val) for val in row.values]
-                sheet.append_row(row_data)
+            # Replace headers and data in one write
+            self._write_sheet(sheet, missions_df)
             
             return {'success': True, 'message': f'Synced {len(missions_df)} missions to Google Sheet'}
         except Exception as e:
             return {'success': False, 'message': f'Error syncing missions: {e}'}
     
+    def _row_number(self, sheet, id_column, id_val):
+        """Sheet row number of an id, from a cached id -> row index (rebuilt once on a miss)"""
+        index = self._row_indexes.get(sheet.title)
+        if index is None or id_val not in index:
+            values = sheet.get_all_values()
+            col = values[0].index(id_column) if values else 0
+            index = {
+                row[col]: row_number
+                for row_number, row in enumerate(values[1:], start=2)  # Start at 2 due to header
+                if col < len(row)
+            }
+            self._row_indexes[sheet.title] = index
+        return index.get(id_val)
+    
+    def _update_status_cells(self, sheet, id_column, id_val, status_col, assignment_col, new_status, current_assignment):
+        """Write status (and assignment) cells of one row in a single batch_update"""
+        row_number = self._row_number(sheet, id_column, id_val)
+        if row_number is None:
+            return False
+        
+        data = [{'range': gspread_utils.rowcol_to_a1(row_number, status_col), 'values': [[new_status]]}]
+        if current_assignment:
+            data.append({'range': gspread_utils.rowcol_to_a1(row_number, assignment_col), 'values': [[current_assignment]]})
+        sheet.batch_update(data, raw=False)
+        return True
+    
     def update_pilot_status(self, pilot_id, new_status, current_assignment=None):
         """Update specific pilot status in Google Sheet"""
         try:
@@ -197,16 +357,8 @@ class GoogleSheetsSync:
             if not sheet:
                 return False
             
-            all_records = sheet.get_all_records()
-            
-            for idx, record in enumerate(all_records, start=2):  # Start at 2 due to header
-                if record['pilot_id'] == pilot_id:
-                    sheet.update_cell(idx, 6, new_status)  # status column
-                    if current_assignment:
-                        sheet.update_cell(idx, 7, current_assignment)  # current_assignment column
-                    return True
-            
-            return False
+            # status is column 6, current_assignment column 7
+            return self._update_status_cells(sheet, 'pilot_id', pilot_id, 6, 7, new_status, current_assignment)
         except Exception as e:
             print(f"Error updating pilot status: {e}")
             return False
@@ -218,16 +370,8 @@ class GoogleSheetsSync:
             if not sheet:
                 return False
             
-            all_records = sheet.get_all_records()
-            
-            for idx, record in enumerate(all_records, start=2):  # Start at 2 due to header
-                if record['drone_id'] == drone_id:
-                    sheet.update_cell(idx, 4, new_status)  # status column
-                    if current_assignment:
-                        sheet.update_cell(idx, 6, current_assignment)  # current_assignment column
-                    return True
-            
-            return False
+            # status is column 4, current_assignment column 6
+            return self._update_status_cells(sheet, 'drone_id', drone_id, 4, 6, new_status, current_assignment)
         except Exception as e:
             print(f"Error updating drone status: {e}")
             return False